@@ -3,23 +3,28 @@ GenAI Legal Contract Assistant - Main Application
 Streamlit-based UI for contract analysis
 """
 import streamlit as st
+import logging
 import sys
 from pathlib import Path
-import tempfile
+import hashlib
+import atexit
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-import json
 import nltk
+import orjson
+import pandas as pd
+
+# Logging is configured here, at the entry point; modules only create loggers
+logging.basicConfig(level=logging.INFO)
 
 # Add modules to path
 sys.path.append(str(Path(__file__).parent))
 
 import config
-from modules.document_parser import DocumentParser
-from modules.nlp_analyzer import NLPAnalyzer
+# Parser, NLP, LLM and export modules pull in heavy libraries (pdfplumber,
+# spaCy, LLM SDKs, ReportLab); they are imported lazily by the getters below
 from modules.risk_assessor import RiskAssessor
-from modules.llm_processor import LLMProcessor
 from modules.template_matcher import TemplateMatcher
-from modules.export_manager import ExportManager
 from utils.audit_logger import AuditLogger
 from utils.text_processor import TextProcessor
 
@@ -34,6 +39,54 @@ def load_nltk_data():
 load_nltk_data()
 
 
+@st.cache_resource
+def get_parser():
+    from modules.document_parser import DocumentParser
+    return DocumentParser()
+
+
+@st.cache_resource
+def get_nlp_analyzer():
+    from modules.nlp_analyzer import NLPAnalyzer
+    return NLPAnalyzer()
+
+
+@st.cache_resource
+def get_risk_assessor(language):
+    return RiskAssessor(language=language)
+
+
+@st.cache_resource
+def get_template_matcher():
+    return TemplateMatcher()
+
+
+@st.cache_resource
+def get_audit_logger():
+    return AuditLogger()
+
+
+@st.cache_resource
+def get_log_executor():
+    # Audit logs are written in the background so the UI doesn't wait on disk I/O
+    executor = ThreadPoolExecutor(max_workers=2)
+    atexit.register(executor.shutdown)
+    return executor
+
+
+@st.cache_resource
+def get_llm_processor(provider, language):
+    # Keyed on (provider, language); failed constructions are not cached
+    from modules.llm_processor import LLMProcessor
+    return LLMProcessor(provider=provider, language=language)
+
+
+@st.cache_resource
+def get_export_manager():
+    from modules.export_manager import ExportManager
+    return ExportManager()
+
+
 # Page configuration
 st.set_page_config(
     page_title=config.APP_TITLE,
@@ -78,6 +131,8 @@ def initialize_session_state():
         st.session_state.analysis_results = None
     if 'uploaded_file_name' not in st.session_state:
         st.session_state.uploaded_file_name = None
+    if 'document_text' not in st.session_state:
+        st.session_state.document_text = None
 
 
 def render_header():
@@ -156,28 +211,73 @@ def upload_contract():
     return uploaded_file
 
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def _parse_cached(file_hash, filename, _file):
+    """
+    Parse an uploaded file and split it into clauses and sections
+    
+    Results are cached on (file_hash, filename); the _file stream is
+    excluded from the cache key.
+    
+    Returns:
+        Tuple of (parsed document, clauses, sections)
+    """
+    parser = get_parser()
+    parsed_doc = parser.parse_document(_file, filename=filename)
+    clauses = parser.extract_clauses(parsed_doc['text'])
+    sections = parser.extract_sections(parsed_doc['text'])
+    return parsed_doc, clauses, sections
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _analyze_text_cached(file_hash, filename, language, _parsed_doc, _clauses):
+    """
+    Run the NLP, risk and template stages on a parsed document
+    
+    Results are cached on (file_hash, filename, language); the parsed
+    document and clauses are derived from those and excluded from the key.
+    
+    Returns:
+        Tuple of (NLP results, risk results, template matches)
+    """
+    nlp_analyzer = get_nlp_analyzer()
+    template_matcher = get_template_matcher()
+    
+    # Per-clause data (lowercased text) computed once for all stages
+    preprocessed = nlp_analyzer.preprocess(_clauses)
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        template_future = executor.submit(
+            template_matcher.match_clauses_to_templates, _clauses, preprocessed
+        )
+        nlp_results = nlp_analyzer.analyze_document(_parsed_doc['text'], _clauses, preprocessed)
+        
+        # Risk assessment needs only the NLP results
+        risk_results = get_risk_assessor(language).assess_contract_risk(
+            _clauses, nlp_results, preprocessed
+        )
+        template_matches = template_future.result()
+    
+    return nlp_results, risk_results, template_matches
+
+
 def analyze_contract(uploaded_file, llm_provider, analysis_depth, language):
     """Perform complete contract analysis"""
     
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.name).suffix) as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_path = tmp_file.name
-        
         progress_bar = st.progress(0)
         status_text = st.empty()
         
+        # The upload is already in memory: hash its buffer without copying
+        # and let the parser read it directly instead of via a temp file
+        with uploaded_file.getbuffer() as buffer:
+            file_hash = hashlib.sha256(buffer).hexdigest()
+        uploaded_file.seek(0)
+        
         # Initialize components
         status_text.text("Initializing analyzers...")
-        parser = DocumentParser()
-        nlp_analyzer = NLPAnalyzer()
-        risk_assessor = RiskAssessor(language=language)
-        template_matcher = TemplateMatcher()
-        audit_logger = AuditLogger()
-        
         try:
-            llm_processor = LLMProcessor(provider=llm_provider, language=language)
+            llm_processor = get_llm_processor(llm_provider, language)
             llm_available = True
         except Exception as e:
             st.warning(f"LLM not available: {e}. Proceeding with NLP-only analysis.")
@@ -185,60 +285,66 @@ def analyze_contract(uploaded_file, llm_provider, analysis_depth, language):
         
         progress_bar.progress(10)
         
-        # Step 1: Parse document
+        # Steps 1-2: Parse document and extract clauses
         status_text.text("📄 Parsing document...")
-        parsed_doc = parser.parse_document(tmp_path)
-        progress_bar.progress(25)
-        
-        # Step 2: Extract clauses
-        status_text.text("📋 Extracting clauses...")
-        clauses = parser.extract_clauses(parsed_doc['text'])
-        sections = parser.extract_sections(parsed_doc['text'])
+        parsed_doc, clauses, sections = _parse_cached(file_hash, uploaded_file.name, uploaded_file)
         progress_bar.progress(35)
         
-        # Step 3: NLP Analysis
-        status_text.text("🔍 Performing NLP analysis...")
-        nlp_results = nlp_analyzer.analyze_document(parsed_doc['text'], clauses)
-        progress_bar.progress(50)
-        
-        # Step 4: Risk Assessment
-        status_text.text("⚠️ Assessing risks...")
-        risk_results = risk_assessor.assess_contract_risk(clauses, nlp_results)
-        progress_bar.progress(70)
-        
-        # Step 5: Template Matching
-        status_text.text("📝 Matching templates...")
-        template_matches = template_matcher.match_clauses_to_templates(clauses)
-        progress_bar.progress(80)
-        
-        # Step 6: LLM Processing (if available)
-        contract_summary = None
-        contract_classification = None
-        clause_explanations = []
-        
-        if llm_available and analysis_depth in ["Standard", "Comprehensive"]:
-            status_text.text("🤖 Generating AI insights...")
-            
-            # Classify contract
-            contract_classification = llm_processor.classify_contract_type(parsed_doc['text'])
+        # LLM output is not cached here: _call_llm already caches successful
+        # responses, and a failed request should be retried on the next run
+        run_llm = llm_available and analysis_depth in ["Standard", "Comprehensive"]
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Classification and summary share one LLM request; it is a
+            # network wait, so it runs while the NLP stages use the CPU
+            insights_future = None
+            if run_llm:
+                insights_future = executor.submit(
+                    llm_processor.combined_classify_and_summarize,
+                    parsed_doc['text'],
+                    parsed_doc['metadata']
+                )
             
-            # Generate summary
-            contract_summary = llm_processor.generate_contract_summary(
-                parsed_doc['text'], 
-                parsed_doc['metadata']
+            # Steps 3-5: NLP analysis, risk assessment and template matching
+            status_text.text("🔍 Analyzing clauses and assessing risks...")
+            nlp_results, risk_results, template_matches = _analyze_text_cached(
+                file_hash, uploaded_file.name, language, parsed_doc, clauses
             )
+            progress_bar.progress(80)
+            
+            # Step 6: LLM Processing (if available)
+            contract_summary = None
+            contract_classification = None
+            clause_explanations = []
             
-            # Explain high-risk clauses
-            if analysis_depth == "Comprehensive":
-                high_risk_clauses = risk_results.get('high_risk_clauses', [])[:5]
-                clause_explanations = llm_processor.batch_explain_clauses(high_risk_clauses, limit=5)
+            if run_llm:
+                status_text.text("🤖 Generating AI insights...")
+                
+                # Explain high-risk clauses while classification/summary finish
+                explanation_future = None
+                if analysis_depth == "Comprehensive":
+                    high_risk_clauses = risk_results.get('high_risk_clauses', [])[:5]
+                    explanation_future = executor.submit(
+                        llm_processor.batch_explain_clauses, high_risk_clauses, limit=5
+                    )
+                
+                wait([f for f in (insights_future, explanation_future) if f])
+                
+                # A failed request is reported once; the NLP results still stand
+                from modules.llm_processor import LLMError
+                try:
+                    contract_classification = insights_future.result()
+                    contract_summary = contract_classification.pop('summary', None)
+                    if explanation_future:
+                        clause_explanations = explanation_future.result()
+                except LLMError as e:
+                    st.warning(f"AI insights not available: {e}. Showing NLP-only results.")
         
         progress_bar.progress(95)
         
         # Compile results
         analysis_results = {
             'metadata': {**parsed_doc['metadata'], 'output_language': language},
-            'document_text': parsed_doc['text'],
             'sections': sections,
             'clauses': clauses,
             'nlp_analysis': nlp_results,
@@ -250,22 +356,24 @@ def analyze_contract(uploaded_file, llm_provider, analysis_depth, language):
             'analysis_timestamp': datetime.now().isoformat()
         }
         
-        # Create audit log
-        audit_logger.log_analysis(
+        progress_bar.progress(100)
+        status_text.text("✅ Analysis complete!")
+        
+        # Create audit log (also for cached results)
+        get_log_executor().submit(
+            get_audit_logger().log_analysis,
             document_info={
                 'filename': uploaded_file.name,
-                'file_path': tmp_path,
+                'file_hash': file_hash,
                 'file_size': uploaded_file.size,
                 'file_type': Path(uploaded_file.name).suffix
             },
             analysis_results=analysis_results
         )
         
-        progress_bar.progress(100)
-        status_text.text("✅ Analysis complete!")
-        
-        # Clean up temp file
-        Path(tmp_path).unlink(missing_ok=True)
+        # Full text is kept out of the results dict so it isn't carried
+        # through every rerun; it is only needed for the JSON export
+        st.session_state.document_text = parsed_doc['text']
         
         return analysis_results
     
@@ -276,8 +384,12 @@ def analyze_contract(uploaded_file, llm_provider, analysis_depth, language):
         return None
 
 
+@st.fragment
 def display_results(results):
     """Display analysis results"""
+    risk_data = results['risk_assessment']
+    nlp_data = results['nlp_analysis']
+    metadata = results['metadata']
     
     # Overview Section
     st.header("Analysis Overview")
@@ -287,16 +399,16 @@ def display_results(results):
     with col1:
         st.metric(
             "Overall Risk",
-            results['risk_assessment']['overall_risk_level'].upper(),
-            f"{results['risk_assessment']['overall_risk_score']}/1.0"
+            risk_data['overall_risk_level'].upper(),
+            f"{risk_data['overall_risk_score']}/1.0"
         )
     
     with col2:
-        high_risk = results['risk_assessment']['risk_distribution']['high']
+        high_risk = risk_data['risk_distribution']['high']
         st.metric("High Risk Clauses", high_risk)
     
     with col3:
-        flags = len(results['risk_assessment']['risk_flags'])
+        flags = len(risk_data['risk_flags'])
         st.metric("Risk Flags", flags)
     
     with col4:
@@ -315,8 +427,8 @@ def display_results(results):
             st.write(f"**Contract Type:** {classification.get('contract_type', 'Unknown')}")
             st.write(f"**Confidence:** {classification.get('confidence', 'N/A')}")
         with col2:
-            st.write(f"**Language:** {results['metadata'].get('language', 'Unknown').upper()}")
-            st.write(f"**Word Count:** {results['metadata'].get('word_count', 'N/A'):,}")
+            st.write(f"**Language:** {metadata.get('language', 'Unknown').upper()}")
+            st.write(f"**Word Count:** {metadata.get('word_count', 'N/A'):,}")
     
     # Contract Summary
     if results.get('contract_summary'):
@@ -329,7 +441,7 @@ def display_results(results):
     st.header("Risk Assessment")
     
     # Risk level indicator
-    risk_level = results['risk_assessment']['overall_risk_level']
+    risk_level = risk_data['overall_risk_level']
     
     if risk_level == 'high':
         st.error("🚨 **HIGH RISK CONTRACT** - Exercise extreme caution before signing")
@@ -339,7 +451,7 @@ def display_results(results):
         st.success("✅ **LOW RISK CONTRACT** - Appears manageable, still review thoroughly")
     
     # Risk Flags
-    risk_flags = results['risk_assessment']['risk_flags']
+    risk_flags = risk_data['risk_flags']
     if risk_flags:
         with st.expander(f"Risk Flags ({len(risk_flags)})", expanded=True):
             for flag in risk_flags:
@@ -362,7 +474,7 @@ def display_results(results):
                 st.markdown("---")
     
     # Unfavorable Terms
-    unfavorable = results['risk_assessment']['unfavorable_terms']
+    unfavorable = risk_data['unfavorable_terms']
     if unfavorable:
         with st.expander(f"Unfavorable Terms ({len(unfavorable)})", expanded=False):
             for term in unfavorable:
@@ -377,7 +489,7 @@ def display_results(results):
     
     # Recommendations
     with st.expander("Recommendations", expanded=True):
-        recommendations = results['risk_assessment']['recommendations']
+        recommendations = risk_data['recommendations']
         for rec in recommendations:
             st.write(rec)
     
@@ -386,101 +498,131 @@ def display_results(results):
     # Detailed Analysis Tabs
     st.header("Detailed Analysis")
     
-    tab1, tab2, tab3, tab4 = st.tabs(["Clauses", "Obligations & Rights", "Entities", "Templates"])
+    # Only the selected view is built, unlike st.tabs which renders all of them
+    detail_view = st.radio(
+        "View",
+        ["Clauses", "Obligations & Rights", "Entities", "Templates"],
+        horizontal=True,
+        key="detail_view",
+        label_visibility="collapsed"
+    )
     
-    with tab1:
+    if detail_view == "Clauses":
         st.subheader("High-Risk Clauses")
-        high_risk_clauses = results['risk_assessment']['high_risk_clauses']
+        high_risk_clauses = risk_data['high_risk_clauses']
         
         if high_risk_clauses:
-            for clause in high_risk_clauses[:10]:
-                with st.expander(f"Clause {clause['clause_number']} - Risk: {clause['risk_score']}"):
-                    st.write(f"**Risk Categories:** {', '.join(clause['risk_categories'])}")
-                    st.write("**Content:**")
-                    st.write(clause['content'][:500] + ('...' if len(clause['content']) > 500 else ''))
-                    
-                    # Show explanation if available
-                    if results.get('clause_explanations'):
-                        for exp in results['clause_explanations']:
-                            if exp['clause_id'] == clause['clause_id']:
-                                st.info(f"**AI Explanation:** {exp['explanation']['explanation']}")
+            clauses_df = pd.DataFrame([
+                {
+                    'Clause': clause['clause_number'],
+                    'Risk Score': clause['risk_score'],
+                    'Risk Categories': ', '.join(clause['risk_categories']),
+                    'Content': TextProcessor.truncate_text(clause['content'], 500)
+                }
+                for clause in high_risk_clauses[:10]
+            ])
+            st.dataframe(clauses_df, use_container_width=True, hide_index=True)
+            
+            # Show explanations if available
+            if results.get('clause_explanations'):
+                with st.expander("AI Explanations"):
+                    for exp in results['clause_explanations']:
+                        st.info(f"**Clause {exp['clause_number']}:** {exp['explanation']['explanation']}")
         else:
             st.success("No high-risk clauses identified!")
     
-    with tab2:
-        col1, col2, col3 = st.columns(3)
+    elif detail_view == "Obligations & Rights":
+        obligations = nlp_data['obligations']
+        rights = nlp_data['rights']
+        prohibitions = nlp_data['prohibitions']
         
-        with col1:
-            st.subheader("Obligations")
-            obligations = results['nlp_analysis']['obligations']
-            st.write(f"Found {len(obligations)} obligation clauses")
-            for ob in obligations[:5]:
-                st.write(f"- {ob['clause_number']}")
+        st.write(
+            f"Found {len(obligations)} obligation clauses, "
+            f"{len(rights)} rights clauses and {len(prohibitions)} prohibitions"
+        )
         
-        with col2:
-            st.subheader("Rights")
-            rights = results['nlp_analysis']['rights']
-            st.write(f"Found {len(rights)} rights clauses")
-            for r in rights[:5]:
-                st.write(f"- {r['clause_number']}")
-        
-        with col3:
-            st.subheader("Prohibitions")
-            prohibitions = results['nlp_analysis']['prohibitions']
-            st.write(f"Found {len(prohibitions)} prohibitions")
-            for p in prohibitions[:5]:
-                st.write(f"- {p['clause_number']}")
-    
-    with tab3:
+        columns = {
+            'Obligations': [ob['clause_number'] for ob in obligations[:5]],
+            'Rights': [r['clause_number'] for r in rights[:5]],
+            'Prohibitions': [p['clause_number'] for p in prohibitions[:5]],
+        }
+        rows = max(len(values) for values in columns.values())
+        if rows:
+            constructs_df = pd.DataFrame({
+                name: values + [''] * (rows - len(values))
+                for name, values in columns.items()
+            })
+            st.dataframe(constructs_df, use_container_width=True, hide_index=True)
+    
+    elif detail_view == "Entities":
         st.subheader("Extracted Entities")
         
         # Parties
-        parties = results['nlp_analysis']['parties']
+        parties = nlp_data['parties']
         if parties:
             st.write("**Parties to the Contract:**")
-            for party in parties:
-                st.write(f"- {party['name']} ({party['type']})")
+            st.dataframe(
+                pd.DataFrame([{'Name': party['name'], 'Type': party['type']} for party in parties]),
+                use_container_width=True,
+                hide_index=True
+            )
         
         # Dates
-        dates = results['nlp_analysis']['dates']
+        dates = nlp_data['dates']
         if dates:
             st.write("**Important Dates:**")
-            for date in dates[:10]:
-                st.write(f"- {date['date']}: {date['context'][:100]}...")
+            st.dataframe(
+                pd.DataFrame([
+                    {'Date': date['date'], 'Context': TextProcessor.truncate_text(date['context'], 100)}
+                    for date in dates[:10]
+                ]),
+                use_container_width=True,
+                hide_index=True
+            )
         
         # Amounts
-        amounts = results['nlp_analysis']['amounts']
+        amounts = nlp_data['amounts']
         if amounts:
             st.write("**Financial Terms:**")
-            for amount in amounts[:10]:
-                st.write(f"- {amount['amount']} ({amount['type']}): {amount['context'][:100]}...")
+            st.dataframe(
+                pd.DataFrame([
+                    {'Amount': amount['amount'], 'Type': amount['type'], 'Context': TextProcessor.truncate_text(amount['context'], 100)}
+                    for amount in amounts[:10]
+                ]),
+                use_container_width=True,
+                hide_index=True
+            )
     
-    with tab4:
+    elif detail_view == "Templates":
         st.subheader("Template Matches")
         template_matches = results['template_matches']
         
         if template_matches:
             st.write(f"Found {len(template_matches)} clauses matching standard templates")
             
-            for match in template_matches[:10]:
-                with st.expander(f"{match['template_title']} - Similarity: {match['similarity_score']}"):
-                    st.write(f"**Clause {match['clause_number']} matches this template type**")
-                    st.write("**Recommended Template:**")
-                    st.info(match['template_text'])
-                    st.write("**Key Points:**")
-                    for point in match['key_points']:
-                        st.write(f"- {point}")
+            matches_df = pd.DataFrame([
+                {
+                    'Clause': match['clause_number'],
+                    'Template': match['template_title'],
+                    'Similarity': match['similarity_score'],
+                    'Recommended Template': match['template_text'],
+                    'Key Points': '; '.join(match['key_points'])
+                }
+                for match in template_matches[:10]
+            ])
+            st.dataframe(matches_df, use_container_width=True, hide_index=True)
         else:
             st.info("No template matches found. Consider using standard SME-friendly clauses.")
 
 
+@st.fragment
 def export_results(results):
     """Handle export functionality"""
     st.header("Export Results")
     
     col1, col2, col3 = st.columns(3)
     
-    export_manager = ExportManager()
+    export_manager = get_export_manager()
     
     with col1:
         if st.button("Export PDF Report"):
@@ -500,7 +642,12 @@ def export_results(results):
     
     with col2:
         if st.button("Export JSON Data"):
-            json_data = json.dumps(results, indent=2, default=str)
+            export_data = {**results, 'document_text': st.session_state.document_text}
+            json_data = orjson.dumps(
+                export_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                default=str
+            )
             st.download_button(
                 "Download JSON",
                 json_data,
@@ -560,6 +707,7 @@ def main():
             st.session_state.analysis_complete = False
             st.session_state.analysis_results = None
             st.session_state.uploaded_file_name = None
+            st.session_state.document_text = None
             st.rerun()
     
     elif not uploaded_file:
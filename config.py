@@ -2,11 +2,14 @@
 Configuration settings for Legal Contract Assistant
 """
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Project Paths
 BASE_DIR = Path(__file__).parent
@@ -17,6 +20,10 @@ TEMPLATES_DIR = BASE_DIR / "templates"
 # Create directories if they don't exist
 AUDIT_LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Load environment variables from the project's .env directly rather than
+# letting python-dotenv inspect the call stack and search parent directories
+load_dotenv(BASE_DIR / ".env", override=False)
+
 # LLM Configuration
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "anthropic")  # "anthropic" or "openai"
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
@@ -26,6 +33,18 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 CLAUDE_MODEL = "claude-3-sonnet-20240229"
 GPT_MODEL = "gpt-4-turbo-preview"
 
+# Retries (with the SDKs' exponential backoff) on rate limits, timeouts and 5xx errors
+LLM_MAX_RETRIES = 4
+
+# Long contracts are summarized chunk-by-chunk, then the partial summaries are combined
+LONG_CONTRACT_CHARS = 20000
+SUMMARY_CHUNK_CHARS = 12000
+
+# Character budgets for contract text embedded in single prompts
+CLASSIFY_EXCERPT_CHARS = 2000
+SUMMARY_EXCERPT_CHARS = 15000
+COMPLIANCE_EXCERPT_CHARS = 10000
+
 # Contract Types
 CONTRACT_TYPES = [
     "Employment Agreement",
@@ -108,8 +127,44 @@ RISK_CATEGORIES = {
     }
 }
 
+# Clauses are matched in lowercase, so normalize the keywords once here
+for _category in RISK_CATEGORIES.values():
+    _category["keywords"] = tuple(sys.intern(kw.lower()) for kw in _category["keywords"])
+del _category
+
+
+# Every keyword, category by category in config order; RISK_AUTOMATON
+# values are indexes into this tuple
+RISK_KEYWORDS = tuple(kw for data in RISK_CATEGORIES.values() for kw in data["keywords"])
+
+
+def _build_risk_automaton():
+    """
+    Build one Aho-Corasick automaton over every RISK_CATEGORIES keyword
+    
+    Each keyword maps to its indexes in RISK_KEYWORDS, so a single pass over
+    a clause finds every category hit. Returns None when pyahocorasick is
+    not installed.
+    """
+    if ahocorasick is None:
+        return None
+    
+    entries = {}
+    for index, keyword in enumerate(RISK_KEYWORDS):
+        entries.setdefault(keyword, []).append(index)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, indexes in entries.items():
+        automaton.add_word(keyword, tuple(indexes))
+    automaton.make_automaton()
+    return automaton
+
+
+RISK_AUTOMATON = _build_risk_automaton()
+
 # NLP Settings
 SPACY_MODEL = "en_core_web_lg"
+NLP_N_PROCESS = 1  # Worker processes for parsing large clause sets; each gets its own copy of the model
 MIN_CLAUSE_LENGTH = 20  # Minimum characters for a valid clause
 MAX_CLAUSE_LENGTH = 5000  # Maximum characters for a single clause
 
@@ -2,26 +2,97 @@
 Document Parser Module
 Handles parsing of PDF, DOCX, and TXT files
 """
+import io
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 import logging
 
-# PDF parsing
-import PyPDF2
-import pdfplumber
+# pdfplumber/PyPDF2, python-docx and langdetect are heavy to import, so each
+# is imported inside the method that needs it
 
-# DOCX parsing
-from docx import Document
-
-# Language detection
-from langdetect import detect, LangDetectException
+# Optional, faster language detection (see SETUP_GUIDE.md); langdetect otherwise
+try:
+    import gcld3
+except ImportError:
+    gcld3 = None
 
 import config
+from modules import pdf_extraction
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Common section headers in contracts. A line starts a section when it begins
+# with one of these (case-insensitively), so they are plain prefixes
+_SECTION_PREFIXES = (
+    'parties', 'parties to the agreement',
+    'recitals', 'whereas',
+    'definitions', 'definitions and interpretation',
+    'term', 'duration', 'period of agreement',
+    'scope of work', 'services', 'obligations',
+    'payment', 'compensation', 'fees',
+    'confidentiality', 'non-disclosure',
+    'termination', 'termination provisions',
+    'liability', 'indemnity', 'indemnification',
+    'dispute resolution', 'arbitration',
+    'intellectual property', 'ip rights',
+    'general provisions', 'miscellaneous',
+    'governing law', 'jurisdiction',
+    'warranties', 'representations',
+)
+_SECTION_PREFIX_LEN = max(len(prefix) for prefix in _SECTION_PREFIXES)
+
+# First level of a prefix trie: headers keyed by their first character
+_SECTION_INDEX = {}
+for _prefix in _SECTION_PREFIXES:
+    _SECTION_INDEX.setdefault(_prefix[0], []).append(_prefix)
+_SECTION_INDEX = {first: tuple(prefixes) for first, prefixes in _SECTION_INDEX.items()}
+del _prefix
+
+
+def _is_section_header(line: str) -> bool:
+    """Check whether a stripped line starts with a known section header"""
+    head = line[:_SECTION_PREFIX_LEN].lower()
+    candidates = _SECTION_INDEX.get(head[:1])
+    return candidates is not None and head.startswith(candidates)
+
+# WordprocessingML tags used when walking a DOCX body
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = _W + 'p'
+_W_TBL = _W + 'tbl'
+_W_TR = _W + 'tr'
+_W_TC = _W + 'tc'
+
+# Language detection samples three windows (start, middle, end) of this many characters
+_LANGUAGE_SAMPLE_CHARS = 300
+
+# Built once and sized for the longest sample (three windows, UTF-8); gcld3
+# calls run under the GIL, so the shared instance is safe across sessions
+_language_identifier = gcld3.NNetLanguageIdentifier(
+    min_num_bytes=0, max_num_bytes=4 * (3 * _LANGUAGE_SAMPLE_CHARS + 2)
+) if gcld3 is not None else None
+
+# Long PDFs are split into page ranges extracted in worker processes. Starting
+# a worker (spawn, pdfplumber import, opening the document) took ~0.3s against
+# ~20-25ms per contract page, so two workers only pay off from about 30 pages
+_PDF_PARALLEL_MIN_PAGES = 30
+_PDF_WORKERS = min(4, os.cpu_count() or 1)
+
+# Numbered clause markers (e.g., "1.", "1.1", "Article 1"), combined into
+# a single capturing group so re.split keeps the headers
+_CLAUSE_SPLIT_RE = re.compile(
+    r'('
+    r'\d+\.\d+\.?\s+[A-Z]'   # 1.1 Title
+    r'|\d+\.\s+[A-Z]'         # 1. Title
+    r'|Article\s+\d+'         # Article 1
+    r'|Clause\s+\d+'          # Clause 1
+    r'|Section\s+\d+'         # Section 1
+    r')'
+)
+
 
 class DocumentParser:
     """Parses legal documents and extracts text content"""
@@ -29,52 +100,59 @@ class DocumentParser:
     def __init__(self):
         self.supported_formats = config.SUPPORTED_FORMATS
         self.max_file_size = config.MAX_FILE_SIZE_MB * 1024 * 1024  # Convert to bytes
+        
+        # Parser for each supported extension
+        self._parsers = {
+            '.pdf': self._parse_pdf,
+            '.docx': self._parse_docx,
+            '.doc': self._parse_docx,
+            '.txt': self._parse_txt,
+        }
     
-    def parse_document(self, file_path: str) -> Dict:
+    def parse_document(self, file_path: Union[str, Path, BinaryIO], filename: Optional[str] = None) -> Dict:
         """
         Main method to parse any supported document format
         
         Args:
-            file_path: Path to the document
+            file_path: Path to the document, or a binary file-like object
+            filename: Name of the document; required for file-like objects
+                without a name, and used to detect the format
             
         Returns:
             Dictionary containing parsed content and metadata
         """
-        path = Path(file_path)
-        
-        # Validate file
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        if path.stat().st_size > self.max_file_size:
-            raise ValueError(f"File size exceeds {config.MAX_FILE_SIZE_MB}MB limit")
-        
-        file_extension = path.suffix.lower()
-        
-        if file_extension not in self.supported_formats:
-            raise ValueError(f"Unsupported file format: {file_extension}")
-        
-        # Parse based on file type
-        if file_extension == '.pdf':
-            content = self._parse_pdf(file_path)
-        elif file_extension in ['.docx', '.doc']:
-            content = self._parse_docx(file_path)
-        elif file_extension == '.txt':
-            content = self._parse_txt(file_path)
+        if hasattr(file_path, 'read'):
+            # In-memory or already open document
+            filename = filename or getattr(file_path, 'name', None)
+            if not filename:
+                raise ValueError("filename is required when parsing a file-like object")
+            file_path.seek(0, io.SEEK_END)
+            file_extension = self._validate_file(filename, file_path.tell())
+            file_path.seek(0)
+            data = file_path.read()
         else:
-            raise ValueError(f"Unsupported format: {file_extension}")
+            filename = filename or Path(file_path).name
+            try:
+                file = open(file_path, 'rb')
+            except FileNotFoundError:
+                raise FileNotFoundError(f"File not found: {file_path}") from None
+            
+            with file:
+                # fstat on the open file sizes it without another path lookup
+                file_extension = self._validate_file(filename, os.fstat(file.fileno()).st_size)
+                data = file.read()
         
-        # Detect language
-        language = self._detect_language(content['text'])
+        file_size = len(data)
+        content = self._parse_content(data, file_extension)
         
         # Extract metadata
         metadata = {
-            'filename': path.name,
+            'filename': Path(filename).name,
             'file_type': file_extension,
-            'file_size': path.stat().st_size,
-            'language': language,
+            'file_size': file_size,
+            'language': content['language'],
             'page_count': content.get('page_count', 1),
-            'word_count': len(content['text'].split()),
+            'word_count': content['word_count'],
             'char_count': len(content['text'])
         }
         
@@ -85,35 +163,64 @@ class DocumentParser:
             'tables': content.get('tables', [])
         }
     
-    def _parse_pdf(self, file_path: str) -> Dict:
-        """Parse PDF file using multiple methods for best results"""
+    def _validate_file(self, filename: str, file_size: int) -> str:
+        """Check the size and format of a document, returning its extension"""
+        if file_size > self.max_file_size:
+            raise ValueError(f"File size exceeds {config.MAX_FILE_SIZE_MB}MB limit")
+        
+        file_extension = Path(filename).suffix.lower()
+        
+        if file_extension not in self.supported_formats:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+        
+        return file_extension
+    
+    def _parse_content(self, data: bytes, file_extension: str) -> Dict:
+        """Parse document bytes and compute the content-derived metadata"""
+        # Parse based on file type
+        parser = self._parsers.get(file_extension)
+        if parser is None:
+            raise ValueError(f"Unsupported format: {file_extension}")
+        content = parser(data)
+        
+        # Detect language
+        content['language'] = self._detect_language(content['text'])
+        # Count line by line: every line break is also whitespace, so this matches
+        # len(text.split()) without building one list of every word in the document
+        content['word_count'] = sum(map(len, map(str.split, content['text'].splitlines())))
+        return content
+    
+    def _parse_pdf(self, data: bytes) -> Dict:
+        """Parse PDF file, using PyPDF2 for pages pdfplumber can't read"""
+        import pdfplumber
+        
         text_content = []
         tables = []
         
         try:
-            # First attempt: Use pdfplumber for better text extraction
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    # Extract text
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append(page_text)
-                    
-                    # Extract tables
-                    page_tables = page.extract_tables()
-                    if page_tables:
-                        tables.extend(page_tables)
+            # pdfplumber gives better text extraction; PyPDF2 only fills in empty pages
+            with pdfplumber.open(io.BytesIO(data)) as pdf:
+                page_total = len(pdf.pages)
+                parallel = page_total >= _PDF_PARALLEL_MIN_PAGES and _PDF_WORKERS > 1
+                page_results = None if parallel else pdf_extraction.extract_pages(pdf)
             
-            full_text = "\n\n".join(text_content)
+            # Long documents are extracted by the workers, after this copy is closed
+            if parallel:
+                page_results = self._extract_pdf_parallel(data, page_total)
             
-            # Fallback to PyPDF2 if pdfplumber fails
-            if not full_text.strip():
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    text_content = []
-                    for page in pdf_reader.pages:
-                        text_content.append(page.extract_text())
-                    full_text = "\n\n".join(text_content)
+            fallback_pages = None
+            for page_number, (page_text, page_tables) in enumerate(page_results):
+                if not page_text:
+                    if fallback_pages is None:
+                        fallback_pages = self._open_pdf_fallback(data).pages
+                    page_text = fallback_pages[page_number].extract_text()
+                if page_text:
+                    text_content.append(page_text)
+                
+                if page_tables:
+                    tables.extend(page_tables)
+            
+            full_text = "\n\n".join(text_content)
             
             return {
                 'text': full_text,
@@ -126,23 +233,51 @@ class DocumentParser:
             logger.error(f"Error parsing PDF: {str(e)}")
             raise
     
-    def _parse_docx(self, file_path: str) -> Dict:
+    def _extract_pdf_parallel(self, data: bytes, page_total: int) -> List[Tuple[str, List]]:
+        """Extract pages in contiguous ranges across worker processes, keeping page order"""
+        step = -(-page_total // _PDF_WORKERS)
+        starts = range(0, page_total, step)
+        
+        # The document goes to each worker once, through the initializer, and
+        # tasks carry only page ranges. Spawn rather than fork: the app process
+        # runs other threads. The pool lives only as long as this parse.
+        with ProcessPoolExecutor(
+            max_workers=len(starts),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=pdf_extraction.init_worker,
+            initargs=(data,)
+        ) as pool:
+            page_results = []
+            for results in pool.map(pdf_extraction.extract_page_range, starts, [start + step for start in starts]):
+                page_results.extend(results)
+        return page_results
+    
+    def _open_pdf_fallback(self, data: bytes) -> 'PyPDF2.PdfReader':
+        """Open a PyPDF2 reader for the same document"""
+        import PyPDF2
+        
+        return PyPDF2.PdfReader(io.BytesIO(data))
+    
+    def _parse_docx(self, data: bytes) -> Dict:
         """Parse DOCX file"""
+        from docx import Document
+        
         try:
-            doc = Document(file_path)
-            
-            # Extract paragraphs
-            paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
-            full_text = "\n\n".join(paragraphs)
+            doc = Document(io.BytesIO(data))
             
-            # Extract tables
+            # Walk the body XML once instead of building Paragraph/Table/Cell
+            # wrappers; the oxml elements compute the same text as python-docx
+            paragraphs = []
             tables = []
-            for table in doc.tables:
-                table_data = []
-                for row in table.rows:
-                    row_data = [cell.text for cell in row.cells]
-                    table_data.append(row_data)
-                tables.append(table_data)
+            for element in doc.element.body.iterchildren(_W_P, _W_TBL):
+                if element.tag == _W_P:
+                    text = element.text
+                    if text.strip():
+                        paragraphs.append(text)
+                else:
+                    tables.append(self._docx_table_rows(element))
+            
+            full_text = "\n\n".join(paragraphs)
             
             return {
                 'text': full_text,
@@ -155,46 +290,75 @@ class DocumentParser:
             logger.error(f"Error parsing DOCX: {str(e)}")
             raise
     
-    def _parse_txt(self, file_path: str) -> Dict:
+    def _docx_table_rows(self, tbl) -> List[List[str]]:
+        """Extract cell text row by row, repeating merged cells like python-docx's row.cells"""
+        table_data = []
+        above = []
+        for tr in tbl.iterchildren(_W_TR):
+            row_data = []
+            for tc in tr.iterchildren(_W_TC):
+                if tc.vMerge == 'continue' and len(row_data) < len(above):
+                    # Vertically merged: the content lives in the cell above
+                    text = above[len(row_data)]
+                else:
+                    text = '\n'.join(p.text for p in tc.iterchildren(_W_P))
+                row_data.extend([text] * tc.grid_span)
+            table_data.append(row_data)
+            above = row_data
+        return table_data
+    
+    def _parse_txt(self, data: bytes) -> Dict:
         """Parse plain text file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-            
-            return {
-                'text': text,
-                'pages': [text],
-                'page_count': 1,
-                'tables': []
-            }
-            
+            text = data.decode('utf-8')
         except UnicodeDecodeError:
             # Try different encoding
-            with open(file_path, 'r', encoding='latin-1') as file:
-                text = file.read()
-            
-            return {
-                'text': text,
-                'pages': [text],
-                'page_count': 1,
-                'tables': []
-            }
+            text = data.decode('latin-1')
+        
+        # Normalize line endings as text-mode reads would
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        
+        return {
+            'text': text,
+            'pages': [text],
+            'page_count': 1,
+            'tables': []
+        }
     
     def _detect_language(self, text: str) -> str:
         """Detect the language of the text"""
+        # Sample the start, middle and end so an English preamble doesn't
+        # hide the language of the body
+        size = _LANGUAGE_SAMPLE_CHARS
+        if len(text) > size * 3:
+            middle = len(text) // 2 - size // 2
+            sample = ' '.join((text[:size], text[middle:middle + size], text[-size:]))
+        else:
+            sample = text
+        
+        if _language_identifier is not None:
+            if not sample.strip():
+                return 'en'
+            # Dominant language by share of the sample, which copes with mixed-script text
+            result = _language_identifier.FindTopNMostFreqLangs(text=sample, num_langs=1)[0]
+            detected_lang = result.language if result.is_reliable else 'en'
+        else:
+            detected_lang = self._detect_with_langdetect(sample)
+        
+        # Map to supported languages
+        if detected_lang in config.SUPPORTED_LANGUAGES:
+            return detected_lang
+        elif detected_lang in ['hi', 'mr', 'bn']:  # Indian languages
+            return 'hi'
+        else:
+            return 'en'  # Default to English
+    
+    def _detect_with_langdetect(self, sample: str) -> str:
+        """Fallback language detection when gcld3 is not installed"""
+        from langdetect import detect, LangDetectException
+        
         try:
-            # Take a sample for language detection (first 1000 chars)
-            sample = text[:1000] if len(text) > 1000 else text
-            detected_lang = detect(sample)
-            
-            # Map to supported languages
-            if detected_lang in config.SUPPORTED_LANGUAGES:
-                return detected_lang
-            elif detected_lang in ['hi', 'mr', 'bn']:  # Indian languages
-                return 'hi'
-            else:
-                return 'en'  # Default to English
-                
+            return detect(sample)
         except LangDetectException:
             logger.warning("Language detection failed, defaulting to English")
             return 'en'
@@ -211,24 +375,6 @@ class DocumentParser:
         """
         sections = {}
         
-        # Common section patterns in contracts
-        section_patterns = [
-            r'(?i)(parties|parties to the agreement)',
-            r'(?i)(recitals|whereas)',
-            r'(?i)(definitions|definitions and interpretation)',
-            r'(?i)(term|duration|period of agreement)',
-            r'(?i)(scope of work|services|obligations)',
-            r'(?i)(payment|compensation|fees)',
-            r'(?i)(confidentiality|non-disclosure)',
-            r'(?i)(termination|termination provisions)',
-            r'(?i)(liability|indemnity|indemnification)',
-            r'(?i)(dispute resolution|arbitration)',
-            r'(?i)(intellectual property|ip rights)',
-            r'(?i)(general provisions|miscellaneous)',
-            r'(?i)(governing law|jurisdiction)',
-            r'(?i)(warranties|representations)',
-        ]
-        
         # Split text into potential sections
         lines = text.split('\n')
         current_section = 'Preamble'
@@ -236,20 +382,16 @@ class DocumentParser:
         
         for line in lines:
             # Check if line is a section header
-            is_header = False
-            for pattern in section_patterns:
-                if re.match(pattern, line.strip()):
-                    # Save previous section
-                    if current_content:
-                        sections[current_section] = '\n'.join(current_content)
-                    
-                    # Start new section
-                    current_section = line.strip()
-                    current_content = []
-                    is_header = True
-                    break
-            
-            if not is_header:
+            stripped = line.strip()
+            if _is_section_header(stripped):
+                # Save previous section
+                if current_content:
+                    sections[current_section] = '\n'.join(current_content)
+                
+                # Start new section
+                current_section = stripped
+                current_content = []
+            else:
                 current_content.append(line)
         
         # Save last section
@@ -269,37 +411,24 @@ class DocumentParser:
             List of clause dictionaries
         """
         clauses = []
+        min_length = config.MIN_CLAUSE_LENGTH
         
-        # Split by numbered clauses (e.g., "1.", "1.1", "Article 1")
-        patterns = [
-            r'\d+\.\d+\.?\s+[A-Z]',    # 1.1 Title
-            r'\d+\.\s+[A-Z]',          # 1. Title
-            r'Article\s+\d+',         # Article 1
-            r'Clause\s+\d+',          # Clause 1
-            r'Section\s+\d+',         # Section 1
-        ]
-        
-        # Combine patterns into a single capturing group
-        combined_pattern = f"({'|'.join(patterns)})"
+        # Split text by clause markers; headers sit at odd indexes, each
+        # followed by its content
+        parts = _CLAUSE_SPLIT_RE.split(text)
         
-        # Split text by clause markers
-        parts = re.split(combined_pattern, text)
-        
-        clause_number = 1
-        for i in range(1, len(parts), 2):
-            if i + 1 < len(parts):
-                header = parts[i]
-                content = parts[i + 1].strip() if parts[i + 1] else ""
-                
-                if len(content) >= config.MIN_CLAUSE_LENGTH:
-                    clauses.append({
-                        'clause_id': f"C{clause_number:03d}",
-                        'clause_number': header.strip(),
-                        'content': content,
-                        'length': len(content),
-                        'word_count': len(content.split())
-                    })
-                    clause_number += 1
+        for header, content in zip(parts[1::2], parts[2::2]):
+            content = content.strip()
+            length = len(content)
+            
+            if length >= min_length:
+                clauses.append({
+                    'clause_id': f"C{len(clauses) + 1:03d}",
+                    'clause_number': header.strip(),
+                    'content': content,
+                    'length': length,
+                    'word_count': len(content.split())
+                })
         
         # If no structured clauses found, split by paragraphs
         if not clauses:
@@ -319,6 +448,7 @@ class DocumentParser:
 
 if __name__ == "__main__":
     # Test the parser
+    logging.basicConfig(level=logging.INFO)
     parser = DocumentParser()
     print("Document Parser initialized successfully")
     print(f"Supported formats: {parser.supported_formats}")
@@ -2,12 +2,13 @@
 Export Manager Module
 Handles PDF export and report generation
 """
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 import logging
+from xml.sax.saxutils import escape
 
+import orjson
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -19,9 +20,15 @@ from reportlab.lib import colors
 
 import config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Font colour for each overall risk level in the executive summary
+_RISK_COLORS = {
+    'HIGH': 'red',
+    'MEDIUM': 'orange',
+    'LOW': 'green'
+}
+
 
 class ExportManager:
     """Manages export of analysis results to various formats"""
@@ -30,6 +37,8 @@ class ExportManager:
         """Initialize export manager"""
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        # Parsed markup of fixed report text, keyed by (text, style name)
+        self._fixed_frags = {}
     
     def _setup_custom_styles(self):
         """Setup custom PDF styles"""
@@ -74,6 +83,41 @@ class ExportManager:
             textColor=colors.green,
             fontSize=12
         ))
+        
+        # List item styles carry their own trailing space instead of a Spacer per item
+        self.styles.add(ParagraphStyle(
+            name='ListItem',
+            parent=self.styles['Normal'],
+            spaceAfter=0.1*inch
+        ))
+        
+        self.styles.add(ParagraphStyle(
+            name='ClauseItem',
+            parent=self.styles['Normal'],
+            spaceAfter=0.15*inch
+        ))
+    
+    def _fixed_paragraph(self, text: str, style_name: str) -> Paragraph:
+        """
+        Build a Paragraph for fixed report text
+        
+        The markup is parsed on first use; later exports build their own
+        Paragraph from the cached fragments instead of re-parsing it.
+        
+        Args:
+            text: Paragraph markup
+            style_name: Name of a style in self.styles
+            
+        Returns:
+            Paragraph flowable
+        """
+        style = self.styles[style_name]
+        frags = self._fixed_frags.get((text, style_name))
+        if frags is None:
+            paragraph = Paragraph(text, style)
+            self._fixed_frags[(text, style_name)] = paragraph.frags
+            return paragraph
+        return Paragraph(text, style, frags=frags)
     
     def export_to_pdf(self, analysis_results: Dict, output_path: str) -> str:
         """
@@ -94,7 +138,8 @@ class ExportManager:
             rightMargin=72,
             leftMargin=72,
             topMargin=72,
-            bottomMargin=18
+            bottomMargin=18,
+            pageCompression=1
         )
         
         story = []
@@ -129,10 +174,7 @@ class ExportManager:
         elements = []
         
         # Title
-        title = Paragraph(
-            "Legal Contract Analysis Report",
-            self.styles['CustomTitle']
-        )
+        title = self._fixed_paragraph("Legal Contract Analysis Report", 'CustomTitle')
         elements.append(title)
         elements.append(Spacer(1, 0.5*inch))
         
@@ -163,10 +205,10 @@ class ExportManager:
         elements.append(Spacer(1, 0.5*inch))
         
         # Disclaimer
-        disclaimer = Paragraph(
+        disclaimer = self._fixed_paragraph(
             "<b>Disclaimer:</b> This analysis is generated by AI and should not be considered as legal advice. "
             "Please consult with a qualified legal professional before making any decisions based on this report.",
-            self.styles['Normal']
+            'Normal'
         )
         elements.append(disclaimer)
         
@@ -176,7 +218,7 @@ class ExportManager:
         """Create executive summary section"""
         elements = []
         
-        elements.append(Paragraph("Executive Summary", self.styles['SectionHeader']))
+        elements.append(self._fixed_paragraph("Executive Summary", 'SectionHeader'))
         elements.append(Spacer(1, 0.2*inch))
         
         # Overall Risk
@@ -184,41 +226,32 @@ class ExportManager:
         overall_risk = risk_data.get('overall_risk_score', 0)
         risk_level = risk_data.get('overall_risk_level', 'low').upper()
         
-        risk_color = {
-            'HIGH': 'red',
-            'MEDIUM': 'orange',
-            'LOW': 'green'
-        }.get(risk_level, 'black')
-        
-        summary_html = f"""
-        <b>Overall Risk Assessment:</b> <font color="{risk_color}"><b>{risk_level}</b></font> 
-        (Score: {overall_risk}/1.0)<br/><br/>
-        """
+        risk_color = _RISK_COLORS.get(risk_level, 'black')
         
-        # Risk distribution
         distribution = risk_data.get('risk_distribution', {})
-        summary_html += f"""
-        <b>Risk Distribution:</b><br/>
-        • High Risk Clauses: {distribution.get('high', 0)}<br/>
-        • Medium Risk Clauses: {distribution.get('medium', 0)}<br/>
-        • Low Risk Clauses: {distribution.get('low', 0)}<br/><br/>
-        """
+        parts = [
+            f'<b>Overall Risk Assessment:</b> <font color="{risk_color}"><b>{risk_level}</b></font>',
+            f"(Score: {overall_risk}/1.0)<br/><br/>",
+            # Risk distribution
+            "<b>Risk Distribution:</b><br/>",
+            f"• High Risk Clauses: {distribution.get('high', 0)}<br/>",
+            f"• Medium Risk Clauses: {distribution.get('medium', 0)}<br/>",
+            f"• Low Risk Clauses: {distribution.get('low', 0)}<br/><br/>",
+        ]
         
         # Contract classification
         if results.get('contract_classification'):
             classification = results['contract_classification']
-            summary_html += f"""
-            <b>Contract Type:</b> {classification.get('contract_type', 'Unknown')}<br/>
-            <b>Confidence:</b> {classification.get('confidence', 'N/A')}<br/><br/>
-            """
+            parts.append(f"<b>Contract Type:</b> {escape(str(classification.get('contract_type', 'Unknown')))}<br/>")
+            parts.append(f"<b>Confidence:</b> {escape(str(classification.get('confidence', 'N/A')))}<br/><br/>")
         
         # Summary text
         if results.get('contract_summary'):
             summary_text = results['contract_summary']
-            summary_html += f"""
-            <b>Contract Summary:</b><br/>
-            {summary_text[:500]}{'...' if len(summary_text) > 500 else ''}
-            """
+            parts.append("<b>Contract Summary:</b><br/>")
+            parts.append(f"{escape(summary_text[:500])}{'...' if len(summary_text) > 500 else ''}")
+        
+        summary_html = "\n".join(parts)
         
         elements.append(Paragraph(summary_html, self.styles['Normal']))
         
@@ -228,7 +261,7 @@ class ExportManager:
         """Create risk assessment section"""
         elements = []
         
-        elements.append(Paragraph("Risk Assessment Details", self.styles['SectionHeader']))
+        elements.append(self._fixed_paragraph("Risk Assessment Details", 'SectionHeader'))
         elements.append(Spacer(1, 0.2*inch))
         
         risk_data = results.get('risk_assessment', {})
@@ -236,32 +269,30 @@ class ExportManager:
         # Risk Flags
         risk_flags = risk_data.get('risk_flags', [])
         if risk_flags:
-            elements.append(Paragraph("<b>Critical Risk Flags:</b>", self.styles['Heading3']))
+            elements.append(self._fixed_paragraph("<b>Critical Risk Flags:</b>", 'Heading3'))
             
             for flag in risk_flags[:10]:  # Top 10 flags
                 severity = flag.get('severity', 'medium').upper()
                 flag_html = f"""
-                <b>[{severity}]</b> {flag.get('title', 'N/A')}<br/>
-                {flag.get('description', 'N/A')}<br/>
-                <i>Recommendation: {flag.get('recommendation', 'N/A')}</i>
+                <b>[{escape(severity)}]</b> {escape(str(flag.get('title', 'N/A')))}<br/>
+                {escape(str(flag.get('description', 'N/A')))}<br/>
+                <i>Recommendation: {escape(str(flag.get('recommendation', 'N/A')))}</i>
                 """
-                elements.append(Paragraph(flag_html, self.styles['Normal']))
-                elements.append(Spacer(1, 0.1*inch))
+                elements.append(Paragraph(flag_html, self.styles['ListItem']))
         
         # Unfavorable Terms
         unfavorable = risk_data.get('unfavorable_terms', [])
         if unfavorable:
             elements.append(Spacer(1, 0.2*inch))
-            elements.append(Paragraph("<b>Unfavorable Terms Identified:</b>", self.styles['Heading3']))
+            elements.append(self._fixed_paragraph("<b>Unfavorable Terms Identified:</b>", 'Heading3'))
             
             for term in unfavorable[:5]:  # Top 5
                 term_html = f"""
-                <b>{term.get('term_type', 'N/A')}</b> (Clause {term.get('clause_number', 'N/A')})<br/>
-                {term.get('explanation', 'N/A')}<br/>
-                <i>Alternative: {term.get('alternative', 'N/A')}</i>
+                <b>{escape(str(term.get('term_type', 'N/A')))}</b> (Clause {escape(str(term.get('clause_number', 'N/A')))})<br/>
+                {escape(str(term.get('explanation', 'N/A')))}<br/>
+                <i>Alternative: {escape(str(term.get('alternative', 'N/A')))}</i>
                 """
-                elements.append(Paragraph(term_html, self.styles['Normal']))
-                elements.append(Spacer(1, 0.1*inch))
+                elements.append(Paragraph(term_html, self.styles['ListItem']))
         
         return elements
     
@@ -269,7 +300,7 @@ class ExportManager:
         """Create clause analysis section"""
         elements = []
         
-        elements.append(Paragraph("Clause-by-Clause Analysis", self.styles['SectionHeader']))
+        elements.append(self._fixed_paragraph("Clause-by-Clause Analysis", 'SectionHeader'))
         elements.append(Spacer(1, 0.2*inch))
         
         # High-risk clauses
@@ -277,27 +308,26 @@ class ExportManager:
         high_risk_clauses = risk_data.get('high_risk_clauses', [])[:10]  # Top 10
         
         if high_risk_clauses:
-            elements.append(Paragraph("<b>High-Risk Clauses Requiring Attention:</b>", self.styles['Heading3']))
+            elements.append(self._fixed_paragraph("<b>High-Risk Clauses Requiring Attention:</b>", 'Heading3'))
             
             for clause in high_risk_clauses:
                 clause_html = f"""
-                <b>Clause {clause.get('clause_number', 'N/A')}</b> 
+                <b>Clause {escape(str(clause.get('clause_number', 'N/A')))}</b> 
                 (Risk Score: {clause.get('risk_score', 0)})<br/>
-                <b>Categories:</b> {', '.join(clause.get('risk_categories', []))}<br/>
-                <b>Content:</b> {clause.get('content', '')[:300]}...
+                <b>Categories:</b> {escape(', '.join(clause.get('risk_categories', [])))}<br/>
+                <b>Content:</b> {escape(clause.get('content', '')[:300])}...
                 """
-                elements.append(Paragraph(clause_html, self.styles['Normal']))
-                elements.append(Spacer(1, 0.15*inch))
+                elements.append(Paragraph(clause_html, self.styles['ClauseItem']))
         
         # Obligations, Rights, Prohibitions
         nlp_data = results.get('nlp_analysis', {})
         
         if nlp_data.get('obligations'):
             elements.append(Spacer(1, 0.2*inch))
-            elements.append(Paragraph("<b>Key Obligations:</b>", self.styles['Heading3']))
+            elements.append(self._fixed_paragraph("<b>Key Obligations:</b>", 'Heading3'))
             for item in nlp_data['obligations'][:5]:
                 elements.append(Paragraph(
-                    f"• {item.get('content', '')[:200]}...",
+                    f"• {escape(item.get('content', '')[:200])}...",
                     self.styles['Normal']
                 ))
         
@@ -307,7 +337,7 @@ class ExportManager:
         """Create recommendations section"""
         elements = []
         
-        elements.append(Paragraph("Recommendations", self.styles['SectionHeader']))
+        elements.append(self._fixed_paragraph("Recommendations", 'SectionHeader'))
         elements.append(Spacer(1, 0.2*inch))
         
         risk_data = results.get('risk_assessment', {})
@@ -315,22 +345,21 @@ class ExportManager:
         
         if recommendations:
             for idx, rec in enumerate(recommendations, 1):
-                elements.append(Paragraph(f"{idx}. {rec}", self.styles['Normal']))
-                elements.append(Spacer(1, 0.1*inch))
+                elements.append(Paragraph(f"{idx}. {escape(str(rec))}", self.styles['ListItem']))
         else:
-            elements.append(Paragraph(
+            elements.append(self._fixed_paragraph(
                 "No specific recommendations at this time. Review all flagged items above.",
-                self.styles['Normal']
+                'Normal'
             ))
         
         elements.append(Spacer(1, 0.3*inch))
-        elements.append(Paragraph(
+        elements.append(self._fixed_paragraph(
             "<b>Next Steps:</b><br/>"
             "1. Review all high-risk clauses with your legal advisor<br/>"
             "2. Consider suggested alternative clauses<br/>"
             "3. Negotiate unfavorable terms before signing<br/>"
             "4. Ensure all critical clauses are present and clear",
-            self.styles['Normal']
+            'Normal'
         ))
         
         return elements
@@ -348,8 +377,13 @@ class ExportManager:
         """
         logger.info(f"Exporting to JSON: {output_path}")
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(analysis_results, f, indent=2, ensure_ascii=False)
+        # orjson emits UTF-8 bytes directly, so the file is written in binary mode
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(
+                analysis_results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                default=str
+            ))
         
         logger.info(f"JSON export completed: {output_path}")
         return output_path
@@ -367,34 +401,37 @@ class ExportManager:
         """
         logger.info(f"Exporting to TXT: {output_path}")
         
+        parts = [
+            "=" * 80 + "\n",
+            "LEGAL CONTRACT ANALYSIS REPORT\n",
+            "=" * 80 + "\n\n",
+        ]
+        
+        # Metadata
+        metadata = analysis_results.get('metadata', {})
+        parts.append(f"File: {metadata.get('filename', 'N/A')}\n")
+        parts.append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+        parts.append(f"Language: {metadata.get('language', 'N/A').upper()}\n\n")
+        
+        # Risk Summary
+        risk_data = analysis_results.get('risk_assessment', {})
+        parts.append("-" * 80 + "\n")
+        parts.append("RISK ASSESSMENT\n")
+        parts.append("-" * 80 + "\n")
+        parts.append(f"Overall Risk Level: {risk_data.get('overall_risk_level', 'N/A').upper()}\n")
+        parts.append(f"Risk Score: {risk_data.get('overall_risk_score', 0)}/1.0\n\n")
+        
+        # Recommendations
+        recommendations = risk_data.get('recommendations', [])
+        if recommendations:
+            parts.append("\nRECOMMENDATIONS:\n")
+            parts.extend(f"{idx}. {rec}\n" for idx, rec in enumerate(recommendations, 1))
+        
+        parts.append("\n" + "=" * 80 + "\n")
+        parts.append("End of Report\n")
+        
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("LEGAL CONTRACT ANALYSIS REPORT\n")
-            f.write("=" * 80 + "\n\n")
-            
-            # Metadata
-            metadata = analysis_results.get('metadata', {})
-            f.write(f"File: {metadata.get('filename', 'N/A')}\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
-            f.write(f"Language: {metadata.get('language', 'N/A').upper()}\n\n")
-            
-            # Risk Summary
-            risk_data = analysis_results.get('risk_assessment', {})
-            f.write("-" * 80 + "\n")
-            f.write("RISK ASSESSMENT\n")
-            f.write("-" * 80 + "\n")
-            f.write(f"Overall Risk Level: {risk_data.get('overall_risk_level', 'N/A').upper()}\n")
-            f.write(f"Risk Score: {risk_data.get('overall_risk_score', 0)}/1.0\n\n")
-            
-            # Recommendations
-            recommendations = risk_data.get('recommendations', [])
-            if recommendations:
-                f.write("\nRECOMMENDATIONS:\n")
-                for idx, rec in enumerate(recommendations, 1):
-                    f.write(f"{idx}. {rec}\n")
-            
-            f.write("\n" + "=" * 80 + "\n")
-            f.write("End of Report\n")
+            f.write("".join(parts))
         
         logger.info(f"TXT export completed: {output_path}")
         return output_path
@@ -402,5 +439,6 @@ class ExportManager:
 
 if __name__ == "__main__":
     # Test the export manager
+    logging.basicConfig(level=logging.INFO)
     manager = ExportManager()
     print("Export Manager initialized successfully")
@@ -3,10 +3,17 @@ LLM Processor Module
 Integrates with Claude 3 or GPT-4 for legal reasoning and plain language explanations
 """
 import os
+import re
 import json
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 import logging
 
+import httpx
+
 try:
     from anthropic import Anthropic
 except ImportError:
@@ -19,13 +26,71 @@ except ImportError:
 
 import config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class LLMError(Exception):
+    """Raised when a request to the LLM provider fails after the client's retries"""
+
+
+# Upper bound on concurrent requests to the LLM provider
+_MAX_CONCURRENT_REQUESTS = 4
+
+# JSON schemas for responses requested as structured output
+_CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "contract_type": {"type": "string"},
+        "confidence": {"type": "string"},
+        "reasoning": {"type": "string"}
+    },
+    "required": ["contract_type", "confidence", "reasoning"]
+}
+_COMBINED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "contract_type": {"type": "string"},
+        "confidence": {"type": "string"},
+        "reasoning": {"type": "string"},
+        "summary": {"type": "string"}
+    },
+    "required": ["contract_type", "confidence", "reasoning", "summary"]
+}
+_TERM_EXPLANATIONS_SCHEMA = {
+    "type": "object",
+    "additionalProperties": {"type": "string"}
+}
+_REDLINES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "redlines": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "clause_id": {"type": "string"},
+                    "suggestion": {"type": "string"}
+                },
+                "required": ["clause_id", "suggestion"]
+            }
+        }
+    },
+    "required": ["redlines"]
+}
+
+# Per-clause header in batched explanations: "### CLAUSE 1", also with a
+# trailing title ("### CLAUSE 1: Payment Terms") or bold ("**Clause 1**")
+_CLAUSE_HEADER_RE = re.compile(
+    r'^[ \t>]*[#*]+[ \t*]*CLAUSE[ \t]+(\d+)\b.*$', re.MULTILINE | re.IGNORECASE
+)
+
+
 class LLMProcessor:
     """Processes legal contracts using LLM for reasoning and explanations"""
     
+    # Number of LLM responses kept in memory, keyed by model and prompt
+    cache_size = 512
+    
     def __init__(self, provider: Optional[str] = None, language: str = "English"):
         """
         Initialize LLM client
@@ -37,23 +102,40 @@ class LLMProcessor:
         self.provider = provider or config.LLM_PROVIDER
         self.language = language or "English"
         
+        # HTTP/2 lets concurrent batch requests share one kept-alive connection
+        http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=_MAX_CONCURRENT_REQUESTS)
+        )
+        
         if self.provider == "anthropic":
             if not Anthropic:
                 raise ImportError("anthropic package not installed. Run: pip install anthropic")
             if not config.ANTHROPIC_API_KEY:
                 raise ValueError("ANTHROPIC_API_KEY not set in environment")
-            self.client = Anthropic(api_key=config.ANTHROPIC_API_KEY)
+            self.client = Anthropic(
+                api_key=config.ANTHROPIC_API_KEY,
+                http_client=http_client,
+                max_retries=config.LLM_MAX_RETRIES
+            )
             self.model = config.CLAUDE_MODEL
         elif self.provider == "openai":
             if not OpenAI:
                 raise ImportError("openai package not installed. Run: pip install openai")
             if not config.OPENAI_API_KEY:
                 raise ValueError("OPENAI_API_KEY not set in environment")
-            self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+            self.client = OpenAI(
+                api_key=config.OPENAI_API_KEY,
+                http_client=http_client,
+                max_retries=config.LLM_MAX_RETRIES
+            )
             self.model = config.GPT_MODEL
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
         
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         logger.info(f"LLM Processor initialized with {self.provider}")
     
     def classify_contract_type(self, text: str) -> Dict:
@@ -66,6 +148,8 @@ class LLMProcessor:
         Returns:
             Dictionary with contract type and confidence
         """
+        excerpt = text[:config.CLASSIFY_EXCERPT_CHARS]
+        
         prompt = f"""Analyze the following contract excerpt and classify its type.
 
 Contract Types:
@@ -81,7 +165,7 @@ Contract Types:
 - License Agreement
 
 Contract Excerpt:
-{text[:2000]}
+{excerpt}
 
 Respond in JSON format:
 {{
@@ -90,18 +174,22 @@ Respond in JSON format:
     "reasoning": "brief explanation"
 }}"""
 
-        response = self._call_llm(prompt, max_tokens=300)
+        response = self._call_llm(prompt, max_tokens=300, schema=_CLASSIFICATION_SCHEMA)
         
         try:
             result = json.loads(response)
-            return result
         except json.JSONDecodeError:
-            # Fallback parsing
-            return {
-                "contract_type": "Unknown",
-                "confidence": "low",
-                "reasoning": response
-            }
+            result = None
+        
+        if isinstance(result, dict):
+            return result
+        
+        # Fallback parsing (not JSON, or JSON that isn't an object)
+        return {
+            "contract_type": "Unknown",
+            "confidence": "low",
+            "reasoning": response
+        }
     
     def generate_contract_summary(self, text: str, metadata: Dict) -> str:
         """
@@ -115,7 +203,7 @@ Respond in JSON format:
             Plain language summary
         """
         # Truncate if too long
-        text_sample = text[:15000] if len(text) > 15000 else text
+        text_sample = text[:config.SUMMARY_EXCERPT_CHARS]
         
         prompt = f"""You are a legal expert helping small business owners in India understand contracts.
 
@@ -142,6 +230,168 @@ Write in simple business language that a non-lawyer can understand. Use bullet p
         summary = self._call_llm(prompt, max_tokens=1000)
         return summary
     
+    def combined_classify_and_summarize(self, text: str, metadata: Dict) -> Dict:
+        """
+        Classify the contract and generate its summary in a single LLM call
+        
+        Args:
+            text: Full contract text
+            metadata: Contract metadata
+            
+        Returns:
+            Dictionary with contract type, confidence, reasoning and summary
+        """
+        # Long contracts don't fit one prompt: classify from the opening
+        # excerpt while the summary is map-reduced over chunks
+        if len(text) > config.LONG_CONTRACT_CHARS:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                classification_future = executor.submit(self.classify_contract_type, text)
+                summary = self.summarize_long(text, metadata)
+                return {**classification_future.result(), 'summary': summary}
+        
+        # Truncate if too long
+        text_sample = text[:config.SUMMARY_EXCERPT_CHARS]
+        contract_types = '\n'.join(f"- {t}" for t in config.CONTRACT_TYPES)
+        
+        prompt = f"""You are a legal expert helping small business owners in India understand contracts.
+
+Classify the type of this contract and generate a concise, plain-language summary suitable for a small business owner.
+
+Contract Types:
+{contract_types}
+
+Contract Details:
+- Word Count: {metadata.get('word_count', 'N/A')}
+- Language: {metadata.get('language', 'English')}
+
+Contract Text:
+{text_sample}
+
+The summary should cover:
+1. What type of contract this is
+2. Who are the parties involved
+3. What is the main purpose/scope
+4. Key obligations of each party
+5. Important dates or timelines
+6. Payment terms (if applicable)
+7. Termination conditions
+
+Write the summary in simple business language that a non-lawyer can understand. Use bullet points for clarity.
+
+Respond in JSON format:
+{{
+    "contract_type": "the most likely type",
+    "confidence": "high/medium/low",
+    "reasoning": "brief explanation",
+    "summary": "the plain-language summary"
+}}"""
+
+        response = self._call_llm(prompt, max_tokens=1300, schema=_COMBINED_SCHEMA)
+        
+        try:
+            result = json.loads(response)
+        except json.JSONDecodeError:
+            result = None
+        
+        if isinstance(result, dict):
+            result.setdefault('summary', '')
+            return result
+        
+        # Fallback parsing (not JSON, or JSON that isn't an object)
+        return {
+            "contract_type": "Unknown",
+            "confidence": "low",
+            "reasoning": "Could not parse classification",
+            "summary": response
+        }
+    
+    def summarize_long(self, text: str, metadata: Dict) -> str:
+        """
+        Summarize a long contract by map-reducing over chunks
+        
+        Each chunk is summarized concurrently, then the partial summaries
+        are combined into one plain language summary.
+        
+        Args:
+            text: Full contract text
+            metadata: Contract metadata
+            
+        Returns:
+            Plain language summary
+        """
+        chunks = self._split_into_chunks(text, config.SUMMARY_CHUNK_CHARS)
+        if len(chunks) == 1:
+            return self.generate_contract_summary(text, metadata)
+        
+        total = len(chunks)
+        with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_REQUESTS, total)) as executor:
+            partial_summaries = list(executor.map(
+                lambda item: self._summarize_chunk(item[1], item[0], total),
+                enumerate(chunks, 1)
+            ))
+        
+        combined_notes = '\n\n'.join(
+            f"Part {idx}:\n{summary}" for idx, summary in enumerate(partial_summaries, 1)
+        )
+        
+        prompt = f"""You are a legal expert helping small business owners in India understand contracts.
+
+Below are notes on each part of a long contract. Combine them into one concise, plain-language summary of the whole contract suitable for a small business owner.
+
+Contract Details:
+- Word Count: {metadata.get('word_count', 'N/A')}
+- Language: {metadata.get('language', 'English')}
+
+Notes:
+{combined_notes}
+
+Provide a summary covering:
+1. What type of contract this is
+2. Who are the parties involved
+3. What is the main purpose/scope
+4. Key obligations of each party
+5. Important dates or timelines
+6. Payment terms (if applicable)
+7. Termination conditions
+
+Write in simple business language that a non-lawyer can understand. Use bullet points for clarity."""
+
+        return self._call_llm(prompt, max_tokens=1000)
+    
+    def _summarize_chunk(self, chunk: str, part: int, total: int) -> str:
+        """Summarize one chunk of a long contract as short notes"""
+        prompt = f"""You are a legal expert reviewing part {part} of {total} of a contract.
+
+Contract Text (part {part} of {total}):
+{chunk}
+
+Write brief bullet-point notes on anything in this part about: the parties, purpose/scope, obligations, dates or timelines, payment terms, and termination conditions. Skip topics this part does not mention."""
+
+        return self._call_llm(prompt, max_tokens=500)
+    
+    @staticmethod
+    def _split_into_chunks(text: str, chunk_size: int) -> List[str]:
+        """Split text into chunks of at most chunk_size chars on paragraph boundaries"""
+        chunks = []
+        current = []
+        current_length = 0
+        
+        for paragraph in text.split('\n\n'):
+            # Hard-split paragraphs that are too long on their own
+            pieces = [paragraph[i:i + chunk_size] for i in range(0, len(paragraph), chunk_size)] or ['']
+            for piece in pieces:
+                if current and current_length + len(piece) + 2 > chunk_size:
+                    chunks.append('\n\n'.join(current))
+                    current = []
+                    current_length = 0
+                current.append(piece)
+                current_length += len(piece) + 2
+        
+        if current:
+            chunks.append('\n\n'.join(current))
+        
+        return [chunk for chunk in chunks if chunk.strip()] or [text]
+    
     def explain_clause(self, clause_content: str, clause_type: str) -> Dict:
         """
         Explain a specific clause in plain language
@@ -233,7 +483,7 @@ Format as JSON:
     ...
 }}"""
 
-        response = self._call_llm(prompt, max_tokens=600)
+        response = self._call_llm(prompt, max_tokens=600, schema=_TERM_EXPLANATIONS_SCHEMA)
         
         try:
             explanations = json.loads(response)
@@ -253,12 +503,14 @@ Format as JSON:
         Returns:
             Dictionary with compliance observations
         """
+        excerpt = text[:config.COMPLIANCE_EXCERPT_CHARS]
+        
         prompt = f"""You are a legal expert advising Indian small and medium businesses.
 
 Contract Type: {contract_type}
 
 Contract Excerpt:
-{text[:10000]}
+{excerpt}
 
 Identify key compliance considerations for this type of contract in India:
 1. Is there mention of governing law? (Indian law is generally preferable)
@@ -280,16 +532,79 @@ Provide observations in simple bullet points. Focus on what a small business sho
         """
         Generate specific suggestions for modifying high-risk clauses
         
+        All clauses go out in one request for structured output; any clause
+        missing from the response is retried on its own.
+        
         Args:
             high_risk_clauses: List of high-risk clause dictionaries
             
         Returns:
             List of redline suggestions
         """
+        clauses = high_risk_clauses[:5]  # Limit to top 5
+        if not clauses:
+            return []
+        
+        clause_blocks = '\n\n'.join(
+            f"### {clause['clause_id']}\n"
+            f"Risk Level: {clause['risk_level']}\n"
+            f"Risk Categories: {', '.join(clause.get('risk_categories', []))}\n"
+            f"{clause['content'][:500]}"
+            for clause in clauses
+        )
+        
+        prompt = f"""You are a legal advisor helping a small business negotiate a contract.
+
+For each high-risk clause below, suggest specific redlines (modifications) to make it more balanced.
+
+{clause_blocks}
+
+For each clause provide:
+1. What to remove or soften
+2. What to add for protection
+3. Specific alternative wording
+
+Be practical and concise.
+
+Respond in JSON format, with one entry per clause using the id from its header:
+{{
+    "redlines": [
+        {{"clause_id": "the clause id", "suggestion": "the redline suggestions"}}
+    ]
+}}"""
+
+        response = self._call_llm(prompt, max_tokens=500 * len(clauses), schema=_REDLINES_SCHEMA)
+        
+        try:
+            redlines = json.loads(response).get('redlines')
+        except (json.JSONDecodeError, AttributeError):
+            redlines = None
+        if not isinstance(redlines, list):
+            logger.warning("Could not parse batched redline response, retrying per clause")
+            redlines = []
+        
+        by_id = {
+            str(item.get('clause_id')): item['suggestion']
+            for item in redlines
+            if isinstance(item, dict) and item.get('suggestion')
+        }
+        
         suggestions = []
+        for clause in clauses:
+            suggestion = by_id.get(clause['clause_id'])
+            if suggestion is None:
+                suggestion = self._redline_clause(clause)
+            suggestions.append({
+                'clause_id': clause['clause_id'],
+                'clause_number': clause['clause_number'],
+                'suggestion': suggestion
+            })
         
-        for clause in high_risk_clauses[:5]:  # Limit to top 5
-            prompt = f"""You are a legal advisor helping a small business negotiate a contract.
+        return suggestions
+    
+    def _redline_clause(self, clause: Dict) -> str:
+        """Generate redline suggestions for a single high-risk clause"""
+        prompt = f"""You are a legal advisor helping a small business negotiate a contract.
 
 High-Risk Clause:
 {clause['content'][:500]}
@@ -305,26 +620,27 @@ Provide:
 
 Be practical and concise."""
 
-            response = self._call_llm(prompt, max_tokens=500)
-            
-            suggestions.append({
-                'clause_id': clause['clause_id'],
-                'clause_number': clause['clause_number'],
-                'suggestion': response
-            })
-        
-        return suggestions
+        return self._call_llm(prompt, max_tokens=500)
     
-    def _call_llm(self, prompt: str, max_tokens: int = 1000) -> str:
+    def _call_llm(self, prompt: str, max_tokens: int = 1000, no_cache: bool = False,
+                  schema: Optional[Dict] = None) -> str:
         """
         Call the configured LLM provider
         
+        Successful responses are cached in memory, so repeated prompts (e.g.
+        boilerplate clauses seen in earlier contracts) skip the network call.
+        
         Args:
             prompt: The prompt text
             max_tokens: Maximum tokens in response
+            no_cache: Always call the provider, bypassing the response cache
+            schema: JSON schema to request the response as structured output
             
         Returns:
-            LLM response text
+            LLM response text (JSON text when a schema is given)
+            
+        Raises:
+            LLMError: If the provider request fails
         """
         # Add language instruction to the prompt if not English
         if self.language and "Hindi" in self.language:
@@ -333,44 +649,99 @@ Be practical and concise."""
             else:
                 lang_instruction = "\n\nCRITICAL: PLEASE PROVIDE YOUR ENTIRE RESPONSE IN HINDI. Translate all legal explanations, summaries, and recommendations into clear, professional Hindi."
             prompt = prompt + lang_instruction
-            
+        
+        cache_key = hashlib.blake2b(
+            f"{self.model}|{max_tokens}|{schema is not None}|{prompt}".encode('utf-8'), digest_size=16
+        ).digest()
+        if not no_cache:
+            with self._cache_lock:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._cache.move_to_end(cache_key)
+                    return cached
+        
         try:
-            if self.provider == "anthropic":
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=max_tokens,
-                    messages=[{
-                        "role": "user",
-                        "content": prompt
-                    }]
-                )
-                return response.content[0].text
-            
-            elif self.provider == "openai":
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    max_tokens=max_tokens,
-                    messages=[{
-                        "role": "user",
-                        "content": prompt
-                    }]
-                )
-                return response.choices[0].message.content
-            
+            response_text = self._request_completion(prompt, max_tokens, schema)
         except Exception as e:
             logger.error(f"LLM call failed: {str(e)}")
-            return f"Error: Unable to process request - {str(e)}"
+            raise LLMError(f"Unable to process request - {str(e)}") from e
+        
+        with self._cache_lock:
+            self._cache[cache_key] = response_text
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return response_text
+    
+    def _request_completion(self, prompt: str, max_tokens: int, schema: Optional[Dict] = None) -> str:
+        """
+        Send one prompt to the provider and return the response text
+        
+        Sampling is greedy (temperature 0) so a prompt gets the same answer
+        whether it is served from the cache or the provider.
+        """
+        if self.provider == "anthropic":
+            structured = {}
+            if schema is not None:
+                # Forcing a tool call makes the model return input matching the schema
+                structured = {
+                    "tools": [{
+                        "name": "respond",
+                        "description": "Return the requested JSON response",
+                        "input_schema": schema
+                    }],
+                    "tool_choice": {"type": "tool", "name": "respond"}
+                }
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                temperature=0,
+                messages=[{
+                    "role": "user",
+                    "content": prompt
+                }],
+                **structured
+            )
+            if schema is not None:
+                tool_use = next(block for block in response.content if block.type == "tool_use")
+                return json.dumps(tool_use.input, ensure_ascii=False)
+            return response.content[0].text
+        
+        structured = {}
+        if schema is not None:
+            # JSON mode; the configured GPT model predates json_schema response formats
+            structured = {"response_format": {"type": "json_object"}}
+        response = self.client.chat.completions.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=0,
+            messages=[{
+                "role": "user",
+                "content": prompt
+            }],
+            **structured
+        )
+        return response.choices[0].message.content
     
-    def batch_explain_clauses(self, clauses: List[Dict], limit: int = 10) -> List[Dict]:
+    def batch_explain_clauses(self, clauses: List[Dict], limit: int = 10, batch_size: int = 5) -> List[Dict]:
         """
         Explain multiple clauses efficiently
         
+        Clauses are sent to the LLM in groups of batch_size, one request per
+        group, and the numbered response is split back into explanations.
+        The group requests run concurrently. Clauses repeating the same text
+        and type are explained once and share the explanation.
+        
         Args:
             clauses: List of clause dictionaries
             limit: Maximum number of clauses to explain
+            batch_size: Number of clauses explained per LLM request
             
         Returns:
             List of clause explanations
+            
+        Raises:
+            LLMError: If a request to the provider fails
         """
         explanations = []
         
@@ -379,32 +750,97 @@ Be practical and concise."""
             clauses,
             key=lambda x: (x.get('risk_score', 0), x.get('complexity', {}).get('score', 0)),
             reverse=True
-        )
+        )[:limit]
+        
+        # Boilerplate clauses often repeat verbatim, so explain each distinct one once
+        distinct_clauses = {}
+        for clause in sorted_clauses:
+            distinct_clauses.setdefault((clause['content'], clause.get('type', 'General')), clause)
+        
+        distinct = list(distinct_clauses.values())
+        batches = [
+            distinct[start:start + batch_size]
+            for start in range(0, len(distinct), batch_size)
+        ]
+        if not batches:
+            return explanations
+        
+        # Each group is an independent request, so wait on them together
+        with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_REQUESTS, len(batches))) as executor:
+            batch_results = list(executor.map(self._explain_clause_batch, batches))
+        
+        explained = {}
+        for batch, batch_explanations in zip(batches, batch_results):
+            for clause, explanation in zip(batch, batch_explanations):
+                explained[(clause['content'], clause.get('type', 'General'))] = explanation
         
-        for clause in sorted_clauses[:limit]:
-            try:
-                explanation = self.explain_clause(
-                    clause['content'],
-                    clause.get('type', 'General')
-                )
-                explanations.append({
-                    'clause_id': clause['clause_id'],
-                    'clause_number': clause['clause_number'],
-                    'explanation': explanation
-                })
-            except Exception as e:
-                logger.error(f"Failed to explain clause {clause['clause_id']}: {e}")
-                explanations.append({
-                    'clause_id': clause['clause_id'],
-                    'clause_number': clause['clause_number'],
-                    'explanation': {'explanation': 'Unable to generate explanation'}
-                })
+        for clause in sorted_clauses:
+            explanations.append({
+                'clause_id': clause['clause_id'],
+                'clause_number': clause['clause_number'],
+                'explanation': explained[(clause['content'], clause.get('type', 'General'))]
+            })
         
         return explanations
+    
+    def _explain_clause_batch(self, clauses: List[Dict]) -> List[Dict]:
+        """
+        Explain a group of clauses with a single numbered prompt
+        
+        Clauses whose answer is missing from the response are explained
+        one by one.
+        
+        Args:
+            clauses: Clause dictionaries to explain together
+            
+        Returns:
+            Explanation dictionaries in clause order
+        """
+        if len(clauses) == 1:
+            clause = clauses[0]
+            return [self.explain_clause(clause['content'], clause.get('type', 'General'))]
+        
+        clause_blocks = '\n\n'.join(
+            f"### CLAUSE {idx}\nClause Type: {clause.get('type', 'General')}\n{clause['content']}"
+            for idx, clause in enumerate(clauses, 1)
+        )
+        
+        prompt = f"""You are a legal expert helping small business owners understand contract clauses.
+
+Explain each of the {len(clauses)} numbered clauses below.
+
+{clause_blocks}
+
+For each clause provide:
+1. Plain language explanation (what does this clause mean in simple terms?)
+2. Key points (what are the most important things to know?)
+3. Business impact (how does this affect a small business?)
+4. Watch out for (any potential concerns or red flags?)
+
+Start each answer with its header on its own line, exactly as given (e.g. "### CLAUSE 1"), and answer every clause in order.
+Write in simple language suitable for someone without legal training. Be concise but thorough."""
+
+        response = self._call_llm(prompt, max_tokens=800 * len(clauses))
+        
+        # Split the numbered response back into per-clause explanations
+        parts = _CLAUSE_HEADER_RE.split(response)
+        answers = {}
+        for i in range(1, len(parts) - 1, 2):
+            answers.setdefault(int(parts[i]), parts[i + 1].strip())
+        
+        return [
+            {
+                "explanation": answers[idx],
+                "clause_type": clause.get('type', 'General')
+            } if answers.get(idx)
+            else self.explain_clause(clause['content'], clause.get('type', 'General'))
+            for idx, clause in enumerate(clauses, 1)
+        ]
 
 
 if __name__ == "__main__":
     # Test the processor (requires API key)
+    logging.basicConfig(level=logging.INFO)
     try:
         processor = LLMProcessor()
         print(f"LLM Processor initialized successfully with {processor.provider}")
@@ -3,20 +3,237 @@ NLP Analyzer Module
 Performs NLP tasks including NER, clause classification, and entity extraction
 """
 import re
-from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional
 import logging
 
 import spacy
-from spacy.matcher import Matcher, PhraseMatcher
+from spacy.attrs import LOWER
+from spacy.tokens import Doc
 import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 import config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Clauses handed to nlp.pipe per batch
+_PIPE_BATCH_SIZE = 64
+
+# Fewer clauses than this are parsed in-process even when config.NLP_N_PROCESS > 1,
+# since sending the pipeline to worker processes costs more than it saves
+_MIN_CLAUSES_FOR_PROCESSES = 32
+
+# The full-text pass only reads entities and token spans, so these components are skipped
+_ENTITY_PASS_DISABLED = ["tagger", "senter", "sentencizer", "attribute_ruler", "lemmatizer"]
+
+# Most characters of the full text covered by the entity pass, for memory
+_MAX_DOC_CHARS = 1000000
+
+# Longest piece of the full text parsed as one Doc in the entity pass
+_ENTITY_CHUNK_CHARS = 100000
+
+# Entity labels kept by the extractors
+_ENTITY_LABELS = frozenset(config.ENTITY_TYPES)
+_PARTY_LABELS = frozenset(('PERSON', 'ORG'))
+_AMOUNT_LABELS = frozenset(('MONEY', 'CARDINAL', 'PERCENT'))
+
+# Common legal terms counted by extract_key_terms
+_LEGAL_TERMS = (
+    'indemnify', 'indemnification', 'liability', 'warranty', 'guarantee',
+    'termination', 'breach', 'default', 'force majeure', 'arbitration',
+    'jurisdiction', 'governing law', 'confidentiality', 'non-disclosure',
+    'intellectual property', 'assignment', 'subcontract', 'amendment',
+    'renewal', 'penalty', 'damages', 'compensation', 'payment terms'
+)
+
+# Vague wording flagged by detect_ambiguities
+_AMBIGUOUS_TERMS = (
+    'reasonable', 'appropriate', 'substantial', 'material', 'significant',
+    'promptly', 'timely', 'as soon as possible', 'best efforts',
+    'adequate', 'sufficient', 'necessary', 'proper', 'satisfactory'
+)
+
+# Keywords that identify each clause type; a clause takes the type with the most distinct hits
+_CLAUSE_TYPE_KEYWORDS = {
+    'Payment': ('payment', 'fee', 'compensation', 'invoice', 'remuneration'),
+    'Termination': ('termination', 'terminate', 'end the agreement', 'cancel'),
+    'Liability': ('liability', 'liable', 'indemnify', 'indemnification'),
+    'Confidentiality': ('confidential', 'non-disclosure', 'secret', 'proprietary'),
+    'Intellectual Property': ('intellectual property', 'ip', 'copyright', 'patent', 'trademark'),
+    'Warranty': ('warranty', 'warrants', 'guarantee', 'representation'),
+    'Dispute Resolution': ('dispute', 'arbitration', 'mediation', 'litigation'),
+    'Governing Law': ('governing law', 'jurisdiction', 'applicable law'),
+    'Force Majeure': ('force majeure', 'act of god', 'unforeseeable'),
+    'Assignment': ('assignment', 'assign', 'transfer'),
+    'Amendment': ('amendment', 'modify', 'change', 'alter'),
+    'Non-Compete': ('non-compete', 'non-competition', 'restraint of trade'),
+    'Renewal': ('renewal', 'renew', 'extend', 'auto-renew'),
+}
+_CLAUSE_TYPES = tuple(_CLAUSE_TYPE_KEYWORDS)
+# Flat keyword list and the index into _CLAUSE_TYPES of each keyword's type
+_CLAUSE_KEYWORDS = tuple(kw for keywords in _CLAUSE_TYPE_KEYWORDS.values() for kw in keywords)
+_CLAUSE_KEYWORD_TYPE = tuple(
+    index for index, keywords in enumerate(_CLAUSE_TYPE_KEYWORDS.values()) for _ in keywords
+)
+
+# Every obligation/right/prohibition pattern contains one of these words, so a
+# clause whose lowercased text has none of them cannot match
+_MATCH_TRIGGERS = (
+    'shall', 'must', 'will', 'agrees', 'obligated', 'required', 'responsible',
+    'may', 'entitled', 'right', 'permitted', 'authorized', 'prohibited'
+)
+
+# Party introductions searched for by extract_parties, in order
+_PARTY_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'(?i)between\s+([A-Z][A-Za-z\s&.,]+?)\s+(?:and|,)',
+    r'(?i)party\s+(?:of\s+the\s+)?(?:first|second|third)\s+part[:\s]+([A-Z][A-Za-z\s&.,]+?)(?:\s+and|\s+,|\s+\()',
+    r'(?i)(?:hereinafter\s+)?(?:referred\s+to\s+as|called)\s+["\']([A-Za-z\s&]+)["\']',
+))
+
+# Most parties reported by extract_parties
+_MAX_PARTIES = 10
+
+# Words in an upper-cased party name that mark it as an organization
+_ORG_MARKERS_RE = re.compile(r'\b(?:LTD|LLC|INC|PVT|PRIVATE|LIMITED)\b')
+
+
+def _build_automaton(words):
+    """
+    Build an Aho-Corasick automaton mapping each word to its index in words
+    
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for index, word in enumerate(words):
+        automaton.add_word(word, index)
+    automaton.make_automaton()
+    return automaton
+
+
+_LEGAL_TERMS_AUTOMATON = _build_automaton(_LEGAL_TERMS)
+_AMBIGUOUS_TERMS_AUTOMATON = _build_automaton(_AMBIGUOUS_TERMS)
+_CLAUSE_KEYWORDS_AUTOMATON = _build_automaton(_CLAUSE_KEYWORDS)
+_MATCH_TRIGGERS_AUTOMATON = _build_automaton(_MATCH_TRIGGERS)
+
+# Whole-word matcher for the ambiguous terms, used when pyahocorasick is missing
+_AMBIGUOUS_TERMS_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, _AMBIGUOUS_TERMS)) + r')\b')
+
+
+def _is_word_char(char: str) -> bool:
+    """Check whether char counts as part of a word, as for \\w in re"""
+    return char.isalnum() or char == '_'
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end] is not part of a longer word"""
+    return (
+        (start == 0 or not _is_word_char(text[start - 1]))
+        and (end == len(text) or not _is_word_char(text[end]))
+    )
+
+
+def _has_match_trigger(text_lower: str) -> bool:
+    """Check whether lowercased clause text contains any of _MATCH_TRIGGERS"""
+    if _MATCH_TRIGGERS_AUTOMATON is None:
+        return any(trigger in text_lower for trigger in _MATCH_TRIGGERS)
+    return next(_MATCH_TRIGGERS_AUTOMATON.iter(text_lower), None) is not None
+
+
+def _contains_sequence(items: list, sequence: tuple) -> bool:
+    """Check whether sequence occurs as a contiguous run in items"""
+    first = sequence[0]
+    rest = list(sequence[1:])
+    size = len(sequence)
+    index = -1
+    try:
+        while True:
+            # Jump straight to the next occurrence of the first element
+            index = items.index(first, index + 1)
+            if items[index + 1:index + size] == rest:
+                return True
+    except ValueError:
+        return False
+
+
+def _party_key(name: str) -> str:
+    """Normalize a party name for duplicate detection"""
+    return ' '.join(name.split()).casefold()
+
+
+def _preview(content: str) -> str:
+    """Shorten clause content to the 200-char preview shown in result lists"""
+    return content[:200] + '...' if len(content) > 200 else content
+
+
+@lru_cache(maxsize=2)
+def _load_spacy_model(name: str):
+    """
+    Load a spaCy pipeline once per process so every NLPAnalyzer shares it
+    
+    Only sentence boundaries are read from the dependency parse, so the parser
+    is left out and the much cheaper senter (or a rule-based sentencizer for
+    models without one) segments sentences instead.
+    """
+    nlp = spacy.load(name, exclude=["parser"])
+    if "senter" in nlp.disabled:
+        nlp.enable_pipe("senter")
+    elif "senter" not in nlp.pipe_names:
+        nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def _cut_point(text: str, start: int, limit: int) -> int:
+    """
+    Find where to end a piece of text that starts at start and must end by limit
+    
+    Returns:
+        Index just after the last paragraph break before limit, else after the
+        last space, else limit itself
+    """
+    cut = text.rfind("\n\n", start, limit)
+    if cut > start:
+        return cut + 2
+    cut = text.rfind(" ", start, limit)
+    return cut + 1 if cut > start else limit
+
+
+def _cap_text(text: str) -> str:
+    """Limit text to _MAX_DOC_CHARS without cutting through a word"""
+    if len(text) <= _MAX_DOC_CHARS:
+        return text
+    return text[:_cut_point(text, 0, _MAX_DOC_CHARS)]
+
+
+def _split_text(text: str, size: int) -> List[str]:
+    """
+    Split text into pieces of at most size characters, cutting after a
+    paragraph break where possible, else after a space
+    
+    Args:
+        text: Text to split
+        size: Maximum piece length
+        
+    Returns:
+        List of pieces that concatenate back to text
+    """
+    pieces = []
+    start = 0
+    while len(text) - start > size:
+        end = _cut_point(text, start, start + size)
+        pieces.append(text[start:end])
+        start = end
+    pieces.append(text[start:])
+    return pieces
+
 
 class NLPAnalyzer:
     """Performs comprehensive NLP analysis on legal contracts"""
@@ -24,18 +241,14 @@ class NLPAnalyzer:
     def __init__(self):
         """Initialize NLP models and tools"""
         try:
-            self.nlp = spacy.load(config.SPACY_MODEL)
+            self.nlp = _load_spacy_model(config.SPACY_MODEL)
         except OSError:
             logger.warning(f"{config.SPACY_MODEL} not found, using smaller model")
             try:
-                self.nlp = spacy.load("en_core_web_sm")
+                self.nlp = _load_spacy_model("en_core_web_sm")
             except OSError:
                 raise OSError("No spaCy model found. Please run: python -m spacy download en_core_web_lg")
         
-        # Initialize matchers
-        self.matcher = Matcher(self.nlp.vocab)
-        self.phrase_matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
-        
         # Initialize NLTK
         try:
             self.stop_words = set(stopwords.words('english'))
@@ -47,200 +260,298 @@ class NLPAnalyzer:
         self._setup_patterns()
     
     def _setup_patterns(self):
-        """Setup spaCy patterns for identifying legal constructs"""
+        """Setup word patterns for identifying legal constructs"""
         
         # Obligation patterns (SHALL, MUST, WILL, AGREE TO)
         obligation_patterns = [
-            [{"LOWER": "shall"}],
-            [{"LOWER": "must"}],
-            [{"LOWER": "will"}],
-            [{"LOWER": "agrees"}, {"LOWER": "to"}],
-            [{"LOWER": "obligated"}, {"LOWER": "to"}],
-            [{"LOWER": "required"}, {"LOWER": "to"}],
-            [{"LOWER": "responsible"}, {"LOWER": "for"}],
+            "shall",
+            "must",
+            "will",
+            "agrees to",
+            "obligated to",
+            "required to",
+            "responsible for",
         ]
-        self.matcher.add("OBLIGATION", obligation_patterns)
         
         # Right patterns (MAY, ENTITLED TO, HAS THE RIGHT)
         right_patterns = [
-            [{"LOWER": "may"}],
-            [{"LOWER": "entitled"}, {"LOWER": "to"}],
-            [{"LOWER": "has"}, {"LOWER": "the"}, {"LOWER": "right"}],
-            [{"LOWER": "permitted"}, {"LOWER": "to"}],
-            [{"LOWER": "authorized"}, {"LOWER": "to"}],
+            "may",
+            "entitled to",
+            "has the right",
+            "permitted to",
+            "authorized to",
         ]
-        self.matcher.add("RIGHT", right_patterns)
         
         # Prohibition patterns (SHALL NOT, MUST NOT, PROHIBITED)
         prohibition_patterns = [
-            [{"LOWER": "shall"}, {"LOWER": "not"}],
-            [{"LOWER": "must"}, {"LOWER": "not"}],
-            [{"LOWER": "will"}, {"LOWER": "not"}],
-            [{"LOWER": "prohibited"}, {"LOWER": "from"}],
-            [{"LOWER": "not"}, {"LOWER": "permitted"}],
-            [{"LOWER": "may"}, {"LOWER": "not"}],
+            "shall not",
+            "must not",
+            "will not",
+            "prohibited from",
+            "not permitted",
+            "may not",
+        ]
+        
+        # Labels and pattern words are compared as StringStore hashes
+        strings = self.nlp.vocab.strings
+        self._label_ids = {
+            name: strings.add(name) for name in ("OBLIGATION", "RIGHT", "PROHIBITION")
+        }
+        
+        # _match_labels checks each pattern as a sequence of lowercase token hashes
+        self._lower_patterns = [
+            (self._label_ids[label], tuple(strings.add(word) for word in pattern.split()))
+            for label, patterns in (
+                ("OBLIGATION", obligation_patterns),
+                ("RIGHT", right_patterns),
+                ("PROHIBITION", prohibition_patterns),
+            )
+            for pattern in patterns
         ]
-        self.matcher.add("PROHIBITION", prohibition_patterns)
     
-    def analyze_document(self, text: str, clauses: List[Dict]) -> Dict:
+    def preprocess(self, clauses: List[Dict]) -> Dict:
+        """
+        Compute per-clause data shared by the downstream analyzers
+        
+        Args:
+            clauses: List of extracted clauses
+            
+        Returns:
+            Dictionary with the lowercased content and the preview of each clause, in order
+        """
+        return {
+            'lowercase_text': [clause['content'].lower() for clause in clauses],
+            'previews': [_preview(clause['content']) for clause in clauses]
+        }
+    
+    def analyze_document(self, text: str, clauses: List[Dict],
+                         preprocessed: Optional[Dict] = None) -> Dict:
         """
         Perform comprehensive NLP analysis on the contract
         
         Args:
             text: Full contract text
             clauses: List of extracted clauses
+            preprocessed: Optional output of preprocess for these clauses
             
         Returns:
             Dictionary containing all NLP analysis results
         """
         logger.info("Starting NLP analysis...")
         
-        # Process full document
-        doc = self.nlp(text[:1000000])  # Limit to 1M chars for memory
+        # Entity pass over the full document (capped for memory)
+        doc_text = _cap_text(text)
+        doc = self._parse_full_text(doc_text)
+        
+        # Lowercased clause text is shared with the other analysis stages
+        if not preprocessed:
+            preprocessed = self.preprocess(clauses)
+        lowered = preprocessed['lowercase_text']
+        previews = preprocessed['previews']
+        
+        # Parse each clause once; clause analysis and the matcher share the docs
+        clause_docs = list(self._pipe_clauses(clauses))
+        
+        # One matcher pass serves obligations, rights and prohibitions
+        clause_labels = self._match_labels(clauses, clause_docs, lowered)
+        
+        # One pass over the entities feeds every entity-based extractor
+        entity_results = self._split_entities(doc)
         
         results = {
-            'entities': self.extract_entities(doc),
+            'entities': entity_results['entities'],
             'key_terms': self.extract_key_terms(text),
-            'clause_analysis': self.analyze_clauses(clauses),
-            'obligations': self.identify_obligations(clauses),
-            'rights': self.identify_rights(clauses),
-            'prohibitions': self.identify_prohibitions(clauses),
-            'ambiguities': self.detect_ambiguities(clauses),
-            'dates': self.extract_dates(doc),
-            'amounts': self.extract_amounts(doc),
-            'parties': self.extract_parties(doc)
+            'clause_analysis': self.analyze_clauses(clauses, lowered, clause_docs),
+            'obligations': self.identify_obligations(clauses, clause_labels, previews),
+            'rights': self.identify_rights(clauses, clause_labels, previews),
+            'prohibitions': self.identify_prohibitions(clauses, clause_labels, previews),
+            'ambiguities': self.detect_ambiguities(clauses, lowered, previews),
+            'dates': entity_results['dates'],
+            'amounts': entity_results['amounts'],
+            'parties': self.extract_parties(doc, entity_results['party_entities'], doc_text)
         }
         
         logger.info("NLP analysis completed")
         return results
     
-    def extract_entities(self, doc) -> List[Dict]:
-        """Extract named entities from the document"""
+    def _pipe_clauses(self, clauses: List[Dict]):
+        """Parse clause contents with nlp.pipe, across processes for large clause sets"""
+        contents = (clause['content'] for clause in clauses)
+        n_process = config.NLP_N_PROCESS
+        if n_process <= 1 or len(clauses) < _MIN_CLAUSES_FOR_PROCESSES:
+            return self.nlp.pipe(contents, batch_size=_PIPE_BATCH_SIZE)
+        
+        # Give every worker a share of the clauses
+        batch_size = max(16, -(-len(clauses) // n_process))
+        return self.nlp.pipe(contents, batch_size=batch_size, n_process=n_process)
+    
+    def _parse_full_text(self, text: str):
+        """
+        Run the entity pass over the full contract text
+        
+        The text is parsed in paragraph-aligned pieces, which are joined back
+        into one Doc so entity offsets and contexts span the whole text.
+        
+        Args:
+            text: Full contract text, capped with _cap_text
+            
+        Returns:
+            spaCy Doc for the text
+        """
+        docs = list(self.nlp.pipe(
+            _split_text(text, _ENTITY_CHUNK_CHARS),
+            batch_size=_PIPE_BATCH_SIZE, disable=_ENTITY_PASS_DISABLED
+        ))
+        return docs[0] if len(docs) == 1 else Doc.from_docs(docs, ensure_whitespace=False)
+    
+    def _split_entities(self, doc) -> Dict:
+        """
+        Sort the document's entities into the extractor results in one pass
+        
+        Args:
+            doc: spaCy Doc for the contract
+            
+        Returns:
+            Dictionary with the extract_entities, extract_dates and extract_amounts
+            results, plus the PERSON/ORG spans used by extract_parties
+        """
         entities = []
+        dates = []
+        amounts = []
+        party_entities = []
+        doc_length = len(doc)
         
         for ent in doc.ents:
-            if ent.label_ in config.ENTITY_TYPES:
+            label = ent.label_
+            if label in _ENTITY_LABELS:
                 entities.append({
                     'text': ent.text,
-                    'label': ent.label_,
+                    'label': label,
                     'start': ent.start_char,
                     'end': ent.end_char
                 })
+            
+            if label == 'DATE' or label in _AMOUNT_LABELS:
+                # Get context
+                start = max(0, ent.start - 10)
+                end = min(doc_length, ent.end + 10)
+                context = doc[start:end].text
+                
+                if label == 'DATE':
+                    dates.append({
+                        'date': ent.text,
+                        'context': context
+                    })
+                else:
+                    amounts.append({
+                        'amount': ent.text,
+                        'type': label,
+                        'context': context
+                    })
+            
+            if label in _PARTY_LABELS:
+                party_entities.append(ent)
         
-        return entities
+        return {
+            'entities': entities,
+            'dates': dates,
+            'amounts': amounts,
+            'party_entities': party_entities
+        }
     
-    def extract_parties(self, doc) -> List[Dict]:
+    def extract_entities(self, doc) -> List[Dict]:
+        """Extract named entities from the document"""
+        return self._split_entities(doc)['entities']
+    
+    def extract_parties(self, doc, party_entities: Optional[List] = None,
+                        text: Optional[str] = None) -> List[Dict]:
         """Extract party names from the contract"""
         parties = []
-        seen = set()
-        
-        # Look for party indicators
-        party_patterns = [
-            r'(?i)between\s+([A-Z][A-Za-z\s&.,]+?)\s+(?:and|,)',
-            r'(?i)party\s+(?:of\s+the\s+)?(?:first|second|third)\s+part[:\s]+([A-Z][A-Za-z\s&.,]+?)(?:\s+and|\s+,|\s+\()',
-            r'(?i)(?:hereinafter\s+)?(?:referred\s+to\s+as|called)\s+["\']([A-Za-z\s&]+)["\']',
-        ]
-        
-        text = doc.text
-        for pattern in party_patterns:
-            matches = re.finditer(pattern, text)
+        seen = set()  # _party_key names, so "ACME  LLC" and "Acme LLC" are one party
+        
+        # Look for party indicators; only the first _MAX_PARTIES are reported,
+        # so stop looking once that many are found
+        if text is None:
+            text = doc.text
+        for pattern in _PARTY_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
                 party_name = match.group(1).strip()
-                if party_name and party_name not in seen and len(party_name) > 3:
+                key = _party_key(party_name)
+                if party_name and key not in seen and len(party_name) > 3:
                     parties.append({
                         'name': party_name,
-                        'type': 'Organization' if any(word in party_name.upper() for word in ['LTD', 'LLC', 'INC', 'PVT', 'PRIVATE', 'LIMITED']) else 'Person'
+                        'type': 'Organization' if _ORG_MARKERS_RE.search(party_name.upper()) else 'Person'
                     })
-                    seen.add(party_name)
+                    seen.add(key)
+                    if len(parties) >= _MAX_PARTIES:
+                        return parties
         
         # Also extract from entities
-        for ent in doc.ents:
-            if ent.label_ in ['PERSON', 'ORG'] and ent.text not in seen:
-                parties.append({
-                    'name': ent.text,
-                    'type': ent.label_
-                })
-                seen.add(ent.text)
+        if party_entities is None:
+            party_entities = doc.ents
+        for ent in party_entities:
+            if ent.label_ in _PARTY_LABELS:
+                key = _party_key(ent.text)
+                if key not in seen:
+                    parties.append({
+                        'name': ent.text,
+                        'type': ent.label_
+                    })
+                    seen.add(key)
+                    if len(parties) >= _MAX_PARTIES:
+                        break
         
-        return parties[:10]  # Limit to top 10
+        return parties
     
     def extract_dates(self, doc) -> List[Dict]:
         """Extract important dates from the contract"""
-        dates = []
-        
-        for ent in doc.ents:
-            if ent.label_ == 'DATE':
-                # Get context
-                start = max(0, ent.start - 10)
-                end = min(len(doc), ent.end + 10)
-                context = doc[start:end].text
-                
-                dates.append({
-                    'date': ent.text,
-                    'context': context
-                })
-        
-        return dates
+        return self._split_entities(doc)['dates']
     
     def extract_amounts(self, doc) -> List[Dict]:
         """Extract financial amounts from the contract"""
-        amounts = []
-        
-        for ent in doc.ents:
-            if ent.label_ in ['MONEY', 'CARDINAL', 'PERCENT']:
-                # Get context
-                start = max(0, ent.start - 10)
-                end = min(len(doc), ent.end + 10)
-                context = doc[start:end].text
-                
-                amounts.append({
-                    'amount': ent.text,
-                    'type': ent.label_,
-                    'context': context
-                })
-        
-        return amounts
+        return self._split_entities(doc)['amounts']
     
     def extract_key_terms(self, text: str) -> List[str]:
         """Extract key legal terms and concepts"""
-        # Common legal terms
-        legal_terms = [
-            'indemnify', 'indemnification', 'liability', 'warranty', 'guarantee',
-            'termination', 'breach', 'default', 'force majeure', 'arbitration',
-            'jurisdiction', 'governing law', 'confidentiality', 'non-disclosure',
-            'intellectual property', 'assignment', 'subcontract', 'amendment',
-            'renewal', 'penalty', 'damages', 'compensation', 'payment terms'
-        ]
-        
-        found_terms = []
         text_lower = text.lower()
         
-        for term in legal_terms:
-            if term in text_lower:
-                # Count occurrences
-                count = text_lower.count(term)
-                found_terms.append({
-                    'term': term,
-                    'count': count
-                })
+        if _LEGAL_TERMS_AUTOMATON is None:
+            counts = [text_lower.count(term) for term in _LEGAL_TERMS]
+        else:
+            # Single pass over the text; no term can overlap itself, so the
+            # match counts equal str.count
+            counts = [0] * len(_LEGAL_TERMS)
+            for _, index in _LEGAL_TERMS_AUTOMATON.iter(text_lower):
+                counts[index] += 1
+        
+        found_terms = [
+            {'term': term, 'count': count}
+            for term, count in zip(_LEGAL_TERMS, counts)
+            if count
+        ]
         
         # Sort by frequency
         found_terms.sort(key=lambda x: x['count'], reverse=True)
         return found_terms
     
-    def analyze_clauses(self, clauses: List[Dict]) -> List[Dict]:
+    def analyze_clauses(self, clauses: List[Dict], lowered: Optional[List[str]] = None,
+                        docs: Optional[List] = None) -> List[Dict]:
         """Analyze each clause for type and characteristics"""
         analyzed_clauses = []
         
-        for clause in clauses:
-            content = clause['content']
-            doc = self.nlp(content)
-            
+        if lowered is None:
+            lowered = [clause['content'].lower() for clause in clauses]
+        if docs is None:
+            docs = self._pipe_clauses(clauses)
+        
+        for clause, content_lower, doc in zip(clauses, lowered, docs):
             # Classify clause type
-            clause_type = self._classify_clause_type(content)
+            clause_type = self._classify_clause_type(content_lower)
             
             # Calculate complexity metrics
-            complexity = self._calculate_complexity(content)
+            sentence_count = sum(1 for _ in doc.sents)
+            complexity = self._calculate_complexity(doc, sentence_count)
             
             # Extract entities from clause
             clause_entities = []
@@ -255,57 +566,50 @@ class NLPAnalyzer:
                 'type': clause_type,
                 'complexity': complexity,
                 'entities': clause_entities,
-                'sentence_count': len(list(doc.sents))
+                'sentence_count': sentence_count
             })
         
         return analyzed_clauses
     
-    def _classify_clause_type(self, clause_text: str) -> str:
-        """Classify the type of legal clause"""
-        text_lower = clause_text.lower()
-        
-        # Define clause type keywords
-        clause_types = {
-            'Payment': ['payment', 'fee', 'compensation', 'invoice', 'remuneration'],
-            'Termination': ['termination', 'terminate', 'end the agreement', 'cancel'],
-            'Liability': ['liability', 'liable', 'indemnify', 'indemnification'],
-            'Confidentiality': ['confidential', 'non-disclosure', 'secret', 'proprietary'],
-            'Intellectual Property': ['intellectual property', 'ip', 'copyright', 'patent', 'trademark'],
-            'Warranty': ['warranty', 'warrants', 'guarantee', 'representation'],
-            'Dispute Resolution': ['dispute', 'arbitration', 'mediation', 'litigation'],
-            'Governing Law': ['governing law', 'jurisdiction', 'applicable law'],
-            'Force Majeure': ['force majeure', 'act of god', 'unforeseeable'],
-            'Assignment': ['assignment', 'assign', 'transfer'],
-            'Amendment': ['amendment', 'modify', 'change', 'alter'],
-            'Non-Compete': ['non-compete', 'non-competition', 'restraint of trade'],
-            'Renewal': ['renewal', 'renew', 'extend', 'auto-renew'],
-        }
+    def _classify_clause_type(self, text_lower: str) -> str:
+        """Classify the type of legal clause from its lowercased text"""
+        # Find the distinct keywords present in one scan over the clause
+        if _CLAUSE_KEYWORDS_AUTOMATON is None:
+            hits = [index for index, keyword in enumerate(_CLAUSE_KEYWORDS) if keyword in text_lower]
+        else:
+            hits = {index for _, index in _CLAUSE_KEYWORDS_AUTOMATON.iter(text_lower)}
         
-        # Score each type
-        scores = {}
-        for clause_type, keywords in clause_types.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            if score > 0:
-                scores[clause_type] = score
+        # Score each type; ties go to the type listed first
+        scores = [0] * len(_CLAUSE_TYPES)
+        for index in hits:
+            scores[_CLAUSE_KEYWORD_TYPE[index]] += 1
         
-        if scores:
-            return max(scores, key=scores.get)
+        best = max(range(len(scores)), key=scores.__getitem__)
+        if scores[best]:
+            return _CLAUSE_TYPES[best]
         else:
             return 'General'
     
-    def _calculate_complexity(self, text: str) -> Dict:
-        """Calculate complexity metrics for a clause"""
-        doc = self.nlp(text)
-        
-        sentences = list(doc.sents)
-        words = [token for token in doc if not token.is_punct and not token.is_space]
+    def _calculate_complexity(self, doc, sentence_count: Optional[int] = None) -> Dict:
+        """Calculate complexity metrics for a parsed clause"""
+        if sentence_count is None:
+            sentence_count = sum(1 for _ in doc.sents)
+        
+        # Word count and distinct lemmas in one pass over the tokens
+        word_count = 0
+        unique_words = set()
+        for token in doc:
+            if token.is_punct or token.is_space:
+                continue
+            word_count += 1
+            if token.is_alpha:
+                unique_words.add(token.lemma_.lower())
         
         # Average sentence length
-        avg_sentence_length = len(words) / len(sentences) if sentences else 0
+        avg_sentence_length = word_count / sentence_count if sentence_count else 0
         
         # Lexical diversity
-        unique_words = set([token.lemma_.lower() for token in words if token.is_alpha])
-        lexical_diversity = len(unique_words) / len(words) if words else 0
+        lexical_diversity = len(unique_words) / word_count if word_count else 0
         
         # Complexity score (0-1)
         complexity_score = min(1.0, (avg_sentence_length / 30 + (1 - lexical_diversity)) / 2)
@@ -325,91 +629,118 @@ class NLPAnalyzer:
             'level': level
         }
     
-    def identify_obligations(self, clauses: List[Dict]) -> List[Dict]:
-        """Identify obligation clauses (SHALL, MUST, WILL)"""
-        obligations = []
+    def _match_labels(self, clauses: List[Dict], docs: Optional[List] = None,
+                      lowered: Optional[List[str]] = None) -> List[set]:
+        """
+        Find the legal construct patterns in every clause
         
-        for clause in clauses:
-            doc = self.nlp(clause['content'])
-            matches = self.matcher(doc)
-            
-            has_obligation = any(self.nlp.vocab.strings[match_id] == "OBLIGATION" for match_id, _, _ in matches)
-            
-            if has_obligation:
-                obligations.append({
-                    'clause_id': clause['clause_id'],
-                    'clause_number': clause['clause_number'],
-                    'content': clause['content'][:200] + '...' if len(clause['content']) > 200 else clause['content'],
-                    'type': 'Obligation'
-                })
+        The patterns only match on lowercased token text, so without parsed
+        docs the clauses are tokenized without running the rest of the pipeline.
+        Clauses without any trigger word are neither tokenized nor matched.
         
-        return obligations
+        Args:
+            clauses: List of extracted clauses
+            docs: Optional already-parsed doc per clause
+            lowered: Optional lowercased content per clause
+            
+        Returns:
+            Set of matched label IDs (see _label_ids) per clause, in order
+        """
+        if lowered is None:
+            lowered = [clause['content'].lower() for clause in clauses]
+        candidates = [_has_match_trigger(content_lower) for content_lower in lowered]
+        
+        if docs is None:
+            docs = (
+                self.nlp.make_doc(clause['content']) if candidate else None
+                for clause, candidate in zip(clauses, candidates)
+            )
+        
+        return [
+            self._labels_in(doc) if candidate else set()
+            for doc, candidate in zip(docs, candidates)
+        ]
     
-    def identify_rights(self, clauses: List[Dict]) -> List[Dict]:
+    def _labels_in(self, doc) -> set:
+        """Return the label IDs of the patterns that occur in doc"""
+        lowers = doc.to_array(LOWER).tolist()
+        present = set(lowers)
+        labels = set()
+        for label_id, sequence in self._lower_patterns:
+            if label_id in labels or not present.issuperset(sequence):
+                continue
+            if len(sequence) == 1 or _contains_sequence(lowers, sequence):
+                labels.add(label_id)
+                if len(labels) == len(self._label_ids):
+                    break
+        return labels
+    
+    @staticmethod
+    def _clauses_with_label(clauses: List[Dict], clause_labels: List[set], label_id: int,
+                            clause_type: str, previews: Optional[List[str]] = None) -> List[Dict]:
+        """Collect the clauses whose matcher labels include label_id"""
+        return [
+            {
+                'clause_id': clause['clause_id'],
+                'clause_number': clause['clause_number'],
+                'content': previews[index] if previews is not None else _preview(clause['content']),
+                'type': clause_type
+            }
+            for index, (clause, labels) in enumerate(zip(clauses, clause_labels))
+            if label_id in labels
+        ]
+    
+    def identify_obligations(self, clauses: List[Dict],
+                             clause_labels: Optional[List[set]] = None,
+                             previews: Optional[List[str]] = None) -> List[Dict]:
+        """Identify obligation clauses (SHALL, MUST, WILL)"""
+        if clause_labels is None:
+            clause_labels = self._match_labels(clauses)
+        return self._clauses_with_label(clauses, clause_labels, self._label_ids["OBLIGATION"], 'Obligation', previews)
+    
+    def identify_rights(self, clauses: List[Dict],
+                        clause_labels: Optional[List[set]] = None,
+                        previews: Optional[List[str]] = None) -> List[Dict]:
         """Identify rights clauses (MAY, ENTITLED TO)"""
-        rights = []
-        
-        for clause in clauses:
-            doc = self.nlp(clause['content'])
-            matches = self.matcher(doc)
-            
-            has_right = any(self.nlp.vocab.strings[match_id] == "RIGHT" for match_id, _, _ in matches)
-            
-            if has_right:
-                rights.append({
-                    'clause_id': clause['clause_id'],
-                    'clause_number': clause['clause_number'],
-                    'content': clause['content'][:200] + '...' if len(clause['content']) > 200 else clause['content'],
-                    'type': 'Right'
-                })
-        
-        return rights
+        if clause_labels is None:
+            clause_labels = self._match_labels(clauses)
+        return self._clauses_with_label(clauses, clause_labels, self._label_ids["RIGHT"], 'Right', previews)
     
-    def identify_prohibitions(self, clauses: List[Dict]) -> List[Dict]:
+    def identify_prohibitions(self, clauses: List[Dict],
+                              clause_labels: Optional[List[set]] = None,
+                              previews: Optional[List[str]] = None) -> List[Dict]:
         """Identify prohibition clauses (SHALL NOT, MUST NOT)"""
-        prohibitions = []
-        
-        for clause in clauses:
-            doc = self.nlp(clause['content'])
-            matches = self.matcher(doc)
-            
-            has_prohibition = any(self.nlp.vocab.strings[match_id] == "PROHIBITION" for match_id, _, _ in matches)
-            
-            if has_prohibition:
-                prohibitions.append({
-                    'clause_id': clause['clause_id'],
-                    'clause_number': clause['clause_number'],
-                    'content': clause['content'][:200] + '...' if len(clause['content']) > 200 else clause['content'],
-                    'type': 'Prohibition'
-                })
-        
-        return prohibitions
+        if clause_labels is None:
+            clause_labels = self._match_labels(clauses)
+        return self._clauses_with_label(clauses, clause_labels, self._label_ids["PROHIBITION"], 'Prohibition', previews)
     
-    def detect_ambiguities(self, clauses: List[Dict]) -> List[Dict]:
+    def detect_ambiguities(self, clauses: List[Dict],
+                           lowered: Optional[List[str]] = None,
+                           previews: Optional[List[str]] = None) -> List[Dict]:
         """Detect ambiguous or vague language in clauses"""
         ambiguities = []
         
-        # Ambiguous terms
-        ambiguous_terms = [
-            'reasonable', 'appropriate', 'substantial', 'material', 'significant',
-            'promptly', 'timely', 'as soon as possible', 'best efforts',
-            'adequate', 'sufficient', 'necessary', 'proper', 'satisfactory'
-        ]
-        
-        for clause in clauses:
-            content_lower = clause['content'].lower()
-            found_terms = []
-            
-            for term in ambiguous_terms:
-                if term in content_lower:
-                    found_terms.append(term)
+        if lowered is None:
+            lowered = [clause['content'].lower() for clause in clauses]
+        
+        for index, (clause, content_lower) in enumerate(zip(clauses, lowered)):
+            # Terms only count as whole words ("material" is not in "immaterial")
+            if _AMBIGUOUS_TERMS_AUTOMATON is None:
+                hits = set(_AMBIGUOUS_TERMS_RE.findall(content_lower))
+                found_terms = [term for term in _AMBIGUOUS_TERMS if term in hits]
+            else:
+                hits = {
+                    term_index for end, term_index in _AMBIGUOUS_TERMS_AUTOMATON.iter(content_lower)
+                    if _is_whole_word(content_lower, end + 1 - len(_AMBIGUOUS_TERMS[term_index]), end + 1)
+                }
+                found_terms = [term for term_index, term in enumerate(_AMBIGUOUS_TERMS) if term_index in hits]
             
             if found_terms:
                 ambiguities.append({
                     'clause_id': clause['clause_id'],
                     'clause_number': clause['clause_number'],
                     'ambiguous_terms': found_terms,
-                    'content': clause['content'][:200] + '...' if len(clause['content']) > 200 else clause['content'],
+                    'content': previews[index] if previews is not None else _preview(clause['content']),
                     'severity': 'High' if len(found_terms) > 2 else 'Medium'
                 })
         
@@ -418,5 +749,6 @@ class NLPAnalyzer:
 
 if __name__ == "__main__":
     # Test the analyzer
+    logging.basicConfig(level=logging.INFO)
     analyzer = NLPAnalyzer()
     print("NLP Analyzer initialized successfully")
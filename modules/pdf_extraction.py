@@ -0,0 +1,33 @@
+"""
+PDF Page Extraction
+Runs in the document parser's worker processes; it imports only pdfplumber,
+so spawned workers start without loading config or the other modules
+"""
+import io
+from typing import List, Optional, Tuple
+
+# Document opened once per worker process by init_worker
+_worker_pdf = None
+
+
+def extract_pages(pdf, start: int = 0, stop: Optional[int] = None) -> List[Tuple[str, List]]:
+    """Extract (text, tables) for a range of pages of an open pdfplumber document"""
+    results = []
+    for page in pdf.pages[start:stop]:
+        results.append((page.extract_text() or '', page.extract_tables()))
+        # Release the page's cached character objects
+        page.flush_cache()
+    return results
+
+
+def init_worker(data: bytes):
+    """Worker initializer: open the PDF from the bytes sent once to this worker"""
+    global _worker_pdf
+    import pdfplumber
+    
+    _worker_pdf = pdfplumber.open(io.BytesIO(data))
+
+
+def extract_page_range(start: int, stop: int) -> List[Tuple[str, List]]:
+    """Worker task: extract a page range of the document opened by init_worker"""
+    return extract_pages(_worker_pdf, start, stop)
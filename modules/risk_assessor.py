@@ -3,16 +3,73 @@ Risk Assessor Module
 Evaluates legal and business risks in contracts
 """
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
 from collections import defaultdict
 
+import numpy as np
+
 import config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Category of each config.RISK_KEYWORDS entry, as an index into RISK_CATEGORIES
+_CATEGORY_INDEX = {category: i for i, category in enumerate(config.RISK_CATEGORIES)}
+_KEYWORD_CATEGORY = np.array(
+    [_CATEGORY_INDEX[category]
+     for category, data in config.RISK_CATEGORIES.items()
+     for _ in data['keywords']],
+    dtype=np.intp
+)
+
+
+def _find_keywords(content_lower: str) -> np.ndarray:
+    """
+    Find the RISK_CATEGORIES keywords contained in a lowercased clause
+    
+    Uses the shared Aho-Corasick automaton when available, otherwise falls
+    back to a substring scan per keyword.
+    
+    Matching stays on str rather than encoded bytes: pyahocorasick's default
+    build only accepts str, and ASCII text is already stored one byte per
+    character, so encoding each clause would only add a copy.
+    
+    Returns:
+        Sorted indexes into config.RISK_KEYWORDS, so each category's
+        matches form a contiguous run in config order
+    """
+    if config.RISK_AUTOMATON is None:
+        hits = [i for i, kw in enumerate(config.RISK_KEYWORDS) if kw in content_lower]
+    else:
+        hits = sorted({i for _, indexes in config.RISK_AUTOMATON.iter(content_lower) for i in indexes})
+    return np.array(hits, dtype=np.intp)
+
+
+def _score_clauses(match_counts: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Score every (clause, category) pair from keyword match counts
+    
+    Scoring is based on ABSOLUTE match count, not percentage, so categories
+    with many keywords still trigger properly:
+    5+ matches = HIGH, 3-4 matches = MEDIUM, 1-2 matches = detected but lower.
+    
+    Args:
+        match_counts: (n_clauses, n_categories) array of keyword match counts
+        weights: (n_categories,) array of category weights
+        
+    Returns:
+        (n_clauses, n_categories) array of scores, 0 where nothing matched
+    """
+    base = np.select(
+        [match_counts >= 5, match_counts >= 3, match_counts > 0],
+        [0.7, 0.4, 0.15],
+        default=0.0
+    )
+    scores = np.minimum(1.0, base + match_counts * 0.05) * weights
+    return np.where(match_counts > 0, scores, 0.0)
+
+
 class RiskAssessor:
     """Assesses risks in legal contracts at clause and document level"""
     
@@ -58,21 +115,32 @@ class RiskAssessor:
             }
         }
     
-    def assess_contract_risk(self, clauses: List[Dict], nlp_analysis: Dict) -> Dict:
+    def assess_contract_risk(self, clauses: List[Dict], nlp_analysis: Dict,
+                             preprocessed: Optional[Dict] = None) -> Dict:
         """
         Perform comprehensive risk assessment on the contract
         
         Args:
             clauses: List of analyzed clauses
             nlp_analysis: NLP analysis results
+            preprocessed: Optional output of NLPAnalyzer.preprocess for these clauses
             
         Returns:
             Dictionary containing risk assessment results
         """
         logger.info("Starting risk assessment...")
         
+        # Lowercase each clause once and share it between the checks below
+        if preprocessed:
+            lowered = preprocessed['lowercase_text']
+        else:
+            lowered = [clause['content'].lower() for clause in clauses]
+        
+        # Scan each clause for risk keywords once; scoring and flags share the hits
+        keyword_hits = [_find_keywords(content_lower) for content_lower in lowered]
+        
         # Assess each clause for risks
-        clause_risks = self.assess_clause_risks(clauses)
+        clause_risks = self.assess_clause_risks(clauses, lowered, keyword_hits)
         
         # Calculate overall contract risk score
         overall_risk = self.calculate_overall_risk(clause_risks)
@@ -84,7 +152,7 @@ class RiskAssessor:
         risk_summary = self.categorize_risks(clause_risks)
         
         # Generate risk flags
-        risk_flags = self.generate_risk_flags(clauses, nlp_analysis)
+        risk_flags = self.generate_risk_flags(clauses, nlp_analysis, lowered, keyword_hits)
         
         # Unfavorable terms detection
         unfavorable_terms = self.detect_unfavorable_terms(clauses)
@@ -104,45 +172,46 @@ class RiskAssessor:
         logger.info("Risk assessment completed")
         return results
     
-    def assess_clause_risks(self, clauses: List[Dict]) -> List[Dict]:
+    def assess_clause_risks(self, clauses: List[Dict], lowered: Optional[List[str]] = None,
+                            keyword_hits: Optional[List[np.ndarray]] = None) -> List[Dict]:
         """Assess risk level for each clause"""
-        clause_risks = []
+        if lowered is None:
+            lowered = [clause['content'].lower() for clause in clauses]
+        if keyword_hits is None:
+            keyword_hits = [_find_keywords(content_lower) for content_lower in lowered]
+        categories = list(self.risk_categories)
+        weights = np.array([self.risk_categories[c]['weight'] for c in categories], dtype=np.float64)
+        
+        # Count matches for every (clause, category) pair in a single bincount
+        n_clauses, n_categories = len(clauses), len(categories)
+        if keyword_hits:
+            all_hits = np.concatenate(keyword_hits)
+        else:
+            all_hits = np.empty(0, dtype=np.intp)
+        rows = np.repeat(np.arange(n_clauses), [len(hits) for hits in keyword_hits])
+        match_counts = np.bincount(
+            rows * n_categories + _KEYWORD_CATEGORY[all_hits],
+            minlength=n_clauses * n_categories
+        ).reshape(n_clauses, n_categories).astype(np.float64)
+        scores = _score_clauses(match_counts, weights)
         
-        for clause in clauses:
-            content = clause['content']
-            content_lower = content.lower()
-            
-            # Initialize risk scores for each category
+        clause_risks = []
+        for clause, hits, counts, clause_scores in zip(clauses, keyword_hits, match_counts, scores):
             category_scores = {}
             detected_risks = []
+            hits = hits.tolist()
             
-            # Check each risk category
-            for category, config_data in self.risk_categories.items():
-                keywords = config_data['keywords']
-                weight = config_data['weight']
-                
-                # Count keyword matches
-                matches = sum(1 for keyword in keywords if keyword in content_lower)
-                
-                if matches > 0:
-                    # Calculate category score based on ABSOLUTE match count, not percentage
-                    # This ensures categories with many keywords still trigger properly
-                    if matches >= 5:
-                        # 5+ matches = HIGH risk for this category
-                        score = min(1.0, 0.7 + (matches * 0.05)) * weight
-                    elif matches >= 3:
-                        # 3-4 matches = MEDIUM risk
-                        score = min(1.0, 0.4 + (matches * 0.05)) * weight
-                    else:
-                        # 1-2 matches = detected but lower score
-                        score = min(1.0, 0.15 + (matches * 0.05)) * weight
-                    
-                    category_scores[category] = score
-                    detected_risks.append({
-                        'category': category,
-                        'score': round(score, 2),
-                        'matched_keywords': [kw for kw in keywords if kw in content_lower]
-                    })
+            start = 0
+            for index in np.flatnonzero(counts):
+                end = start + int(counts[index])
+                score = float(clause_scores[index])
+                category_scores[categories[index]] = score
+                detected_risks.append({
+                    'category': categories[index],
+                    'score': round(score, 2),
+                    'matched_keywords': [config.RISK_KEYWORDS[i] for i in hits[start:end]]
+                })
+                start = end
             
             # Calculate overall clause risk score
             if category_scores:
@@ -156,7 +225,7 @@ class RiskAssessor:
             clause_risks.append({
                 'clause_id': clause['clause_id'],
                 'clause_number': clause['clause_number'],
-                'content': content,
+                'content': clause['content'],
                 'risk_score': round(clause_risk_score, 2),
                 'risk_level': risk_level,
                 'detected_risks': detected_risks,
@@ -231,23 +300,30 @@ class RiskAssessor:
         
         return dict(category_stats)
     
-    def generate_risk_flags(self, clauses: List[Dict], nlp_analysis: Dict) -> List[Dict]:
+    def generate_risk_flags(self, clauses: List[Dict], nlp_analysis: Dict,
+                            lowered: Optional[List[str]] = None,
+                            keyword_hits: Optional[List[np.ndarray]] = None) -> List[Dict]:
         """Generate specific risk flags and warnings"""
         flags = []
+        if lowered is None:
+            lowered = [clause['content'].lower() for clause in clauses]
+        if keyword_hits is None:
+            keyword_hits = [_find_keywords(content_lower) for content_lower in lowered]
+        lowered_clauses = list(zip(clauses, lowered))
         
         # Check for manipulative psychological language (CRITICAL)
-        # Load keywords dynamically from config to ensure sync with scoring
-        severe_manipulation = self.risk_categories.get('manipulative_language', {}).get('keywords', [])
-        moderate_manipulation = self.risk_categories.get('emotional_pressure', {}).get('keywords', [])
+        # Keywords come from the config categories to ensure sync with scoring
         
         # Benign keywords are not in risk categories anymore, so we don't count them for risk
         
-        for clause in clauses:
-            content_lower = clause['content'].lower()
-            
+        severe_index = _CATEGORY_INDEX.get('manipulative_language')
+        moderate_index = _CATEGORY_INDEX.get('emotional_pressure')
+        
+        for clause, hits in zip(clauses, keyword_hits):
             # Count matches by severity
-            severe_count = sum(1 for kw in severe_manipulation if kw in content_lower)
-            moderate_count = sum(1 for kw in moderate_manipulation if kw in content_lower)
+            hit_categories = _KEYWORD_CATEGORY[hits]
+            severe_count = int(np.count_nonzero(hit_categories == severe_index))
+            moderate_count = int(np.count_nonzero(hit_categories == moderate_index))
             
             # Determine severity
             if severe_count >= 3:
@@ -287,8 +363,7 @@ class RiskAssessor:
         ]
         
         found_clauses = set()
-        for clause in clauses:
-            content_lower = clause['content'].lower()
+        for content_lower in lowered:
             for critical in critical_clauses:
                 if critical.replace(' ', '') in content_lower.replace(' ', ''):
                     found_clauses.add(critical)
@@ -304,9 +379,9 @@ class RiskAssessor:
             })
         
         # Check for one-sided termination rights
-        termination_clauses = [c for c in clauses if 'termination' in c['content'].lower()]
-        for clause in termination_clauses:
-            if 'at will' in clause['content'].lower() or 'sole discretion' in clause['content'].lower():
+        termination_clauses = [(c, low) for c, low in lowered_clauses if 'termination' in low]
+        for clause, content_lower in termination_clauses:
+            if 'at will' in content_lower or 'sole discretion' in content_lower:
                 flags.append({
                     'type': 'unilateral_termination',
                     'severity': 'high',
@@ -318,7 +393,7 @@ class RiskAssessor:
         
         # Check for excessive penalties
         penalty_keywords = ['penalty', 'liquidated damages', 'fine']
-        penalty_clauses = [c for c in clauses if any(kw in c['content'].lower() for kw in penalty_keywords)]
+        penalty_clauses = [c for c, low in lowered_clauses if any(kw in low for kw in penalty_keywords)]
         if penalty_clauses:
             flags.append({
                 'type': 'penalty_clause',
@@ -330,8 +405,8 @@ class RiskAssessor:
         
         # Check for auto-renewal
         auto_renewal_keywords = ['auto-renew', 'automatic renewal', 'automatically renew']
-        for clause in clauses:
-            if any(kw in clause['content'].lower() for kw in auto_renewal_keywords):
+        for clause, content_lower in lowered_clauses:
+            if any(kw in content_lower for kw in auto_renewal_keywords):
                 flags.append({
                     'type': 'auto_renewal',
                     'severity': 'medium',
@@ -343,8 +418,8 @@ class RiskAssessor:
         
         # Check for IP transfer
         ip_keywords = ['assigns all', 'transfers all', 'ownership of intellectual property']
-        for clause in clauses:
-            if any(kw in clause['content'].lower() for kw in ip_keywords):
+        for clause, content_lower in lowered_clauses:
+            if any(kw in content_lower for kw in ip_keywords):
                 flags.append({
                     'type': 'ip_transfer',
                     'severity': 'high',
@@ -355,9 +430,9 @@ class RiskAssessor:
                 })
         
         # Check for broad indemnification
-        indemnity_clauses = [c for c in clauses if 'indemnif' in c['content'].lower()]
-        for clause in indemnity_clauses:
-            if 'any and all' in clause['content'].lower() or 'unlimited' in clause['content'].lower():
+        indemnity_clauses = [(c, low) for c, low in lowered_clauses if 'indemnif' in low]
+        for clause, content_lower in indemnity_clauses:
+            if 'any and all' in content_lower or 'unlimited' in content_lower:
                 flags.append({
                     'type': 'broad_indemnity',
                     'severity': 'high',
@@ -369,8 +444,8 @@ class RiskAssessor:
         
         # Check for non-compete clauses
         non_compete_keywords = ['non-compete', 'non-competition', 'restraint of trade']
-        for clause in clauses:
-            if any(kw in clause['content'].lower() for kw in non_compete_keywords):
+        for clause, content_lower in lowered_clauses:
+            if any(kw in content_lower for kw in non_compete_keywords):
                 flags.append({
                     'type': 'non_compete',
                     'severity': 'high',
@@ -381,7 +456,7 @@ class RiskAssessor:
                 })
         
         # Check for ambiguous payment terms
-        payment_clauses = [c for c in clauses if any(kw in c['content'].lower() for kw in ['payment', 'fee', 'compensation'])]
+        payment_clauses = [c for c, low in lowered_clauses if any(kw in low for kw in ['payment', 'fee', 'compensation'])]
         for clause in payment_clauses:
             # Check if specific amounts or dates are mentioned
             has_amount = bool(re.search(r'₹|Rs\.?|\$|USD|INR|[0-9,]+', clause['content']))
@@ -541,6 +616,7 @@ class RiskAssessor:
 
 if __name__ == "__main__":
     # Test the risk assessor
+    logging.basicConfig(level=logging.INFO)
     assessor = RiskAssessor()
     print("Risk Assessor initialized successfully")
     print(f"Monitoring {len(assessor.risk_categories)} risk categories")
@@ -3,14 +3,13 @@ Template Matcher Module
 Matches contract clauses against standard templates and suggests improvements
 """
 import json
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import logging
 from difflib import SequenceMatcher
 
 import config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -138,19 +137,33 @@ class TemplateMatcher:
             }
         }
     
-    def match_clauses_to_templates(self, clauses: List[Dict]) -> List[Dict]:
+    def match_clauses_to_templates(self, clauses: List[Dict], preprocessed: Optional[Dict] = None) -> List[Dict]:
         """
         Match contract clauses to standard templates
         
         Args:
             clauses: List of analyzed clauses
+            preprocessed: Optional output of NLPAnalyzer.preprocess for these clauses
             
         Returns:
             List of matches with similarity scores
         """
         matches = []
         
-        for clause in clauses:
+        if preprocessed:
+            lowered = preprocessed['lowercase_text']
+        else:
+            lowered = [clause['content'].lower() for clause in clauses]
+        # SequenceMatcher caches its analysis of the second sequence, so keep
+        # one matcher per template and only swap in each clause
+        template_matchers = {
+            key: self._build_matcher(data['template'].lower())
+            for key, data in self.templates.items()
+        }
+        
+        min_score = 0.3  # Minimum threshold
+        
+        for clause, content_lower in zip(clauses, lowered):
             clause_type = clause.get('type', 'General').lower()
             
             # Find best matching template
@@ -158,17 +171,19 @@ class TemplateMatcher:
             best_score = 0
             
             for template_key, template_data in self.templates.items():
-                # Calculate similarity
-                similarity = self._calculate_similarity(
-                    clause['content'].lower(),
-                    template_data['template'].lower()
-                )
-                
                 # Check if clause type matches template key
                 type_match = template_key in clause_type or clause_type in template_key
+                boost = 0.2 if type_match else 0.0  # Boost for type match
+                
+                # Skip templates whose length-based upper bound on the
+                # similarity can't beat the current best (or reach the threshold)
+                matcher = template_matchers[template_key]
+                matcher.set_seq1(content_lower)
+                if matcher.real_quick_ratio() + boost <= max(best_score, min_score):
+                    continue
                 
-                if type_match:
-                    similarity += 0.2  # Boost for type match
+                # Calculate similarity
+                similarity = matcher.ratio() + boost
                 
                 if similarity > best_score:
                     best_score = similarity
@@ -177,7 +192,7 @@ class TemplateMatcher:
                         'template_data': template_data
                     }
             
-            if best_match and best_score > 0.3:  # Minimum threshold
+            if best_match and best_score > min_score:
                 matches.append({
                     'clause_id': clause['clause_id'],
                     'clause_number': clause['clause_number'],
@@ -195,6 +210,12 @@ class TemplateMatcher:
         """Calculate text similarity using SequenceMatcher"""
         return SequenceMatcher(None, text1, text2).ratio()
     
+    def _build_matcher(self, template_text: str) -> SequenceMatcher:
+        """Create a SequenceMatcher with the template preprocessed as its second sequence"""
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(template_text)
+        return matcher
+    
     def suggest_template_improvements(self, clause: Dict, template_match: Dict) -> Dict:
         """
         Suggest improvements based on template comparison
@@ -291,6 +312,7 @@ class TemplateMatcher:
 
 if __name__ == "__main__":
     # Test the template matcher
+    logging.basicConfig(level=logging.INFO)
     matcher = TemplateMatcher()
     print("Template Matcher initialized successfully")
     print(f"Loaded {len(matcher.templates)} template categories")
@@ -0,0 +1,213 @@
+"""
+Equivalence tests for the document parser
+Compares parsing and splitting results with the implementations they replaced
+"""
+import io
+import re
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+import config
+from modules import document_parser
+from modules.document_parser import DocumentParser
+
+SAMPLE_CONTRACT = Path(__file__).parent / 'utils' / 'sample_contracts' / 'unfavorable_service_agreement.txt'
+
+
+# Section header patterns as they were matched one by one
+SECTION_PATTERNS = [
+    r'(?i)(parties|parties to the agreement)',
+    r'(?i)(recitals|whereas)',
+    r'(?i)(definitions|definitions and interpretation)',
+    r'(?i)(term|duration|period of agreement)',
+    r'(?i)(scope of work|services|obligations)',
+    r'(?i)(payment|compensation|fees)',
+    r'(?i)(confidentiality|non-disclosure)',
+    r'(?i)(termination|termination provisions)',
+    r'(?i)(liability|indemnity|indemnification)',
+    r'(?i)(dispute resolution|arbitration)',
+    r'(?i)(intellectual property|ip rights)',
+    r'(?i)(general provisions|miscellaneous)',
+    r'(?i)(governing law|jurisdiction)',
+    r'(?i)(warranties|representations)',
+]
+
+SECTION_TEXTS = [
+    "",
+    "\n",
+    "No headers here\njust text",
+    "Parties\nAcme Ltd and Beta LLP\n\nPAYMENT TERMS\nNet 30.\n  Termination  \nOn notice.\n",
+    "Terms of use\r\nline one\x0cGoverning law applies\nwhereas the parties\nIP rights\nIP rights\nEnd",
+]
+
+
+def reference_sections(text):
+    """Section split with one re.match per pattern per line"""
+    sections = {}
+    current_section = 'Preamble'
+    current_content = []
+    for line in text.split('\n'):
+        is_header = False
+        for pattern in SECTION_PATTERNS:
+            if re.match(pattern, line.strip()):
+                if current_content:
+                    sections[current_section] = '\n'.join(current_content)
+                current_section = line.strip()
+                current_content = []
+                is_header = True
+                break
+        if not is_header:
+            current_content.append(line)
+    if current_content:
+        sections[current_section] = '\n'.join(current_content)
+    return sections
+
+
+def test_sections_match_reference_on_sample_contract():
+    text = SAMPLE_CONTRACT.read_text(encoding='utf-8')
+    assert DocumentParser().extract_sections(text) == reference_sections(text)
+
+
+def test_sections_match_reference_on_edge_cases():
+    parser = DocumentParser()
+    for text in SECTION_TEXTS:
+        assert parser.extract_sections(text) == reference_sections(text)
+
+
+def build_docx():
+    """A small contract with tabs, line breaks, blank paragraphs and merged table cells"""
+    from docx import Document
+    doc = Document()
+    doc.add_paragraph("SERVICE AGREEMENT")
+    doc.add_paragraph("")
+    para = doc.add_paragraph("1. Payment\tterms")
+    para.add_run().add_break()
+    para.add_run("Net 30 days.")
+    table = doc.add_table(rows=4, cols=3)
+    for row_idx, row in enumerate(table.rows):
+        for col_idx, cell in enumerate(row.cells):
+            cell.text = f"r{row_idx}c{col_idx}"
+    table.cell(0, 0).merge(table.cell(0, 1))  # horizontal span
+    table.cell(1, 2).merge(table.cell(3, 2))  # vertical merge
+    table.cell(2, 0).merge(table.cell(3, 1))  # block merge
+    table.cell(1, 0).add_paragraph("second line")
+    doc.add_paragraph("   ")
+    doc.add_paragraph("2. Termination on 30 days notice.")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def reference_docx_content(data):
+    """Paragraphs and tables read through python-docx's document API"""
+    from docx import Document
+    doc = Document(io.BytesIO(data))
+    paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
+    tables = [[[cell.text for cell in row.cells] for row in table.rows] for table in doc.tables]
+    return "\n\n".join(paragraphs), tables
+
+
+def test_docx_text_and_tables_match_reference():
+    data = build_docx()
+    parsed = DocumentParser().parse_document(io.BytesIO(data), filename='contract.docx')
+    text, tables = reference_docx_content(data)
+    assert parsed['text'] == text
+    assert parsed['tables'] == tables
+    assert len(tables[0]) == 4
+
+
+def build_pdf(pages):
+    """A contract PDF with one paragraph and one small table per page"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Table
+    style = getSampleStyleSheet()['Normal']
+    story = []
+    for page in range(pages):
+        story.append(Paragraph(f"{page + 1}. The Vendor shall invoice the Client monthly for page {page + 1}.", style))
+        story.append(Table([['Item', 'Fee'], [f"Service {page + 1}", '$1,000']]))
+        story.append(PageBreak())
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build(story)
+    return buffer.getvalue()
+
+
+def test_pdf_worker_extraction_matches_serial(monkeypatch):
+    data = build_pdf(5)
+    parser = DocumentParser()
+    serial = parser.parse_document(io.BytesIO(data), filename='contract.pdf')
+
+    monkeypatch.setattr(document_parser, '_PDF_WORKERS', 2)
+    monkeypatch.setattr(document_parser, '_PDF_PARALLEL_MIN_PAGES', 2)
+    parallel = parser.parse_document(io.BytesIO(data), filename='contract.pdf')
+
+    assert parallel == serial
+    assert serial['metadata']['page_count'] == 5
+
+
+CLAUSE_TEXTS = [
+    "",
+    "A single paragraph without numbering that is long enough.\n\nToo short\n\nAnother unnumbered paragraph of sufficient length.",
+    "Article 1 short\nArticle 2 This article has enough content to count.",
+    "1.1 Title of the first clause with content\n2. Next clause also has content\n"
+    "Section 3 applies to all services rendered\nClause 4 covers the remaining terms here",
+    "Preamble text 1.2. Nested numbering with a trailing dot here\n5. A",
+]
+
+
+def reference_clauses(text):
+    """Clause split with re.split over the combined header pattern"""
+    patterns = [
+        r'\d+\.\d+\.?\s+[A-Z]',
+        r'\d+\.\s+[A-Z]',
+        r'Article\s+\d+',
+        r'Clause\s+\d+',
+        r'Section\s+\d+',
+    ]
+    parts = re.split(f"({'|'.join(patterns)})", text)
+    clauses = []
+    clause_number = 1
+    for i in range(1, len(parts), 2):
+        if i + 1 < len(parts):
+            header = parts[i]
+            content = parts[i + 1].strip() if parts[i + 1] else ""
+            if len(content) >= config.MIN_CLAUSE_LENGTH:
+                clauses.append({
+                    'clause_id': f"C{clause_number:03d}",
+                    'clause_number': header.strip(),
+                    'content': content,
+                    'length': len(content),
+                    'word_count': len(content.split())
+                })
+                clause_number += 1
+    if not clauses:
+        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+        for idx, para in enumerate(paragraphs, 1):
+            if len(para) >= config.MIN_CLAUSE_LENGTH:
+                clauses.append({
+                    'clause_id': f"C{idx:03d}",
+                    'clause_number': f"Para {idx}",
+                    'content': para,
+                    'length': len(para),
+                    'word_count': len(para.split())
+                })
+    return clauses
+
+
+def test_clauses_match_reference_on_sample_contract():
+    text = SAMPLE_CONTRACT.read_text(encoding='utf-8')
+    assert DocumentParser().extract_clauses(text) == reference_clauses(text)
+
+
+def test_clauses_match_reference_on_edge_cases():
+    parser = DocumentParser()
+    for text in CLAUSE_TEXTS:
+        assert parser.extract_clauses(text) == reference_clauses(text)
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
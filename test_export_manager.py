@@ -0,0 +1,61 @@
+"""
+Tests for PDF report export
+Contract text and LLM output contain characters that are markup in ReportLab paragraphs
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from modules.export_manager import ExportManager
+
+MARKUP_TEXT = 'Fees < $5,000 & "Vendor" <b>shall</b> pay <unclosed'
+
+
+def markup_results():
+    """Analysis results with markup characters in every interpolated field"""
+    clause = {
+        'clause_number': '1.1 <a>',
+        'risk_score': 0.9,
+        'risk_categories': ['liability & indemnity'],
+        'content': MARKUP_TEXT
+    }
+    return {
+        'metadata': {'filename': 'contract <1>.pdf', 'language': 'en'},
+        'risk_assessment': {
+            'overall_risk_score': 0.9,
+            'overall_risk_level': 'high',
+            'risk_distribution': {'high': 1},
+            'risk_flags': [{
+                'severity': 'high',
+                'title': MARKUP_TEXT,
+                'description': MARKUP_TEXT,
+                'recommendation': MARKUP_TEXT
+            }],
+            'unfavorable_terms': [{
+                'term_type': MARKUP_TEXT,
+                'clause_number': '<2>',
+                'explanation': MARKUP_TEXT,
+                'alternative': MARKUP_TEXT
+            }],
+            'high_risk_clauses': [clause],
+            'recommendations': [MARKUP_TEXT]
+        },
+        'nlp_analysis': {'obligations': [{'content': MARKUP_TEXT}]},
+        'contract_classification': {'contract_type': MARKUP_TEXT, 'confidence': 'high'},
+        'contract_summary': MARKUP_TEXT
+    }
+
+
+def test_pdf_export_escapes_interpolated_text(tmp_path):
+    output_path = tmp_path / 'report.pdf'
+
+    ExportManager().export_to_pdf(markup_results(), str(output_path))
+
+    assert output_path.read_bytes().startswith(b'%PDF')
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,200 @@
+"""
+Tests for LLM response parsing
+Uses canned responses instead of a provider, so no API key is needed
+"""
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from modules.llm_processor import LLMError, LLMProcessor
+
+
+class CannedLLMProcessor(LLMProcessor):
+    """LLMProcessor that answers each request with the next canned response"""
+
+    def __init__(self, *responses):
+        # No provider client: only _call_llm is used by the methods under test
+        self.responses = list(responses)
+        self.prompts = []
+        self.schemas = []
+
+    def _call_llm(self, prompt, max_tokens=1000, no_cache=False, schema=None):
+        self.prompts.append(prompt)
+        self.schemas.append(schema)
+        return self.responses.pop(0)
+
+
+class FailingLLMProcessor(LLMProcessor):
+    """LLMProcessor whose provider requests always fail"""
+
+    def __init__(self):
+        self.language = "English"
+        self.model = "test-model"
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.requests = []
+
+    def _request_completion(self, prompt, max_tokens, schema=None):
+        self.requests.append(prompt)
+        raise httpx.ConnectError("Connection refused")
+
+
+def make_clause(number, content, clause_type='General'):
+    """Build a clause dictionary as the parser and risk assessor produce it"""
+    return {
+        'clause_id': f'clause_{number}',
+        'clause_number': number,
+        'content': content,
+        'type': clause_type,
+        'risk_level': 'high',
+        'risk_categories': ['liability']
+    }
+
+
+def test_split_into_chunks_keeps_paragraphs_together():
+    text = "\n\n".join(["a" * 40, "b" * 40, "c" * 40])
+    chunks = LLMProcessor._split_into_chunks(text, 100)
+    assert chunks == ["a" * 40 + "\n\n" + "b" * 40, "c" * 40]
+
+
+def test_split_into_chunks_hard_splits_oversize_paragraph():
+    text = "short\n\n" + "x" * 250
+    chunks = LLMProcessor._split_into_chunks(text, 100)
+    assert chunks == ["short", "x" * 100, "x" * 100, "x" * 50]
+    assert all(len(chunk) <= 100 for chunk in chunks)
+
+
+def test_split_into_chunks_blank_text():
+    assert LLMProcessor._split_into_chunks("\n\n", 100) == ["\n\n"]
+
+
+def test_explain_clause_batch_well_formed():
+    processor = CannedLLMProcessor(
+        "### CLAUSE 1\nPays within 30 days.\n\n### CLAUSE 2\nEither party may end it."
+    )
+    clauses = [make_clause(1, "Payment terms", 'Payment'), make_clause(2, "Termination", 'Termination')]
+
+    explanations = processor._explain_clause_batch(clauses)
+
+    assert explanations == [
+        {'explanation': "Pays within 30 days.", 'clause_type': 'Payment'},
+        {'explanation': "Either party may end it.", 'clause_type': 'Termination'}
+    ]
+    assert len(processor.prompts) == 1
+
+
+def test_explain_clause_batch_titled_and_bold_headers():
+    processor = CannedLLMProcessor(
+        "Here are the explanations.\n"
+        "### CLAUSE 1: Payment Terms\nPays within 30 days.\n\n"
+        "**Clause 2 - Termination**\nEither party may end it."
+    )
+    clauses = [make_clause(1, "Payment terms"), make_clause(2, "Termination")]
+
+    explanations = processor._explain_clause_batch(clauses)
+
+    assert [e['explanation'] for e in explanations] == ["Pays within 30 days.", "Either party may end it."]
+    assert len(processor.prompts) == 1
+
+
+def test_explain_clause_batch_missing_clause_is_explained_alone():
+    processor = CannedLLMProcessor(
+        "### CLAUSE 1\nPays within 30 days.\n\n### CLAUSE 3\nCapped at fees paid.",
+        "Either party may end it."
+    )
+    clauses = [make_clause(1, "Payment terms"), make_clause(2, "Termination"), make_clause(3, "Liability cap")]
+
+    explanations = processor._explain_clause_batch(clauses)
+
+    assert [e['explanation'] for e in explanations] == [
+        "Pays within 30 days.", "Either party may end it.", "Capped at fees paid."
+    ]
+    assert len(processor.prompts) == 2
+    assert "Termination" in processor.prompts[1]
+
+
+def test_failed_batch_request_raises_without_per_clause_calls():
+    processor = FailingLLMProcessor()
+    clauses = [make_clause(1, "Payment terms"), make_clause(2, "Termination")]
+
+    with pytest.raises(LLMError):
+        processor.batch_explain_clauses(clauses)
+    assert len(processor.requests) == 1
+
+
+def test_combined_classification_parses_json():
+    processor = CannedLLMProcessor(
+        '{"contract_type": "Service Contract", "confidence": "high", '
+        '"reasoning": "Defines services and fees", "summary": "Vendor provides services."}'
+    )
+
+    result = processor.combined_classify_and_summarize("Short contract", {})
+
+    assert result == {
+        'contract_type': "Service Contract",
+        'confidence': "high",
+        'reasoning': "Defines services and fees",
+        'summary': "Vendor provides services."
+    }
+
+
+def test_combined_classification_falls_back_on_non_object_json():
+    processor = CannedLLMProcessor('["Service Contract"]')
+
+    result = processor.combined_classify_and_summarize("Short contract", {})
+
+    assert result['contract_type'] == "Unknown"
+    assert result['summary'] == '["Service Contract"]'
+
+
+def test_redline_suggestions_structured_response():
+    processor = CannedLLMProcessor(
+        '{"redlines": [{"clause_id": "clause_1", "suggestion": "Cap liability at fees paid."}, '
+        '{"clause_id": "clause_2", "suggestion": "Add a 30-day cure period."}]}'
+    )
+    clauses = [make_clause(1, "Unlimited liability"), make_clause(2, "Immediate termination")]
+
+    suggestions = processor.generate_redline_suggestions(clauses)
+
+    assert suggestions == [
+        {'clause_id': 'clause_1', 'clause_number': 1, 'suggestion': "Cap liability at fees paid."},
+        {'clause_id': 'clause_2', 'clause_number': 2, 'suggestion': "Add a 30-day cure period."}
+    ]
+    assert len(processor.prompts) == 1
+    assert processor.schemas[0] is not None
+
+
+def test_redline_suggestions_missing_clause_is_retried_alone():
+    processor = CannedLLMProcessor(
+        '{"redlines": [{"clause_id": "clause_2", "suggestion": "Add a 30-day cure period."}]}',
+        "Cap liability at fees paid."
+    )
+    clauses = [make_clause(1, "Unlimited liability"), make_clause(2, "Immediate termination")]
+
+    suggestions = processor.generate_redline_suggestions(clauses)
+
+    assert [s['suggestion'] for s in suggestions] == ["Cap liability at fees paid.", "Add a 30-day cure period."]
+    assert len(processor.prompts) == 2
+    assert "Unlimited liability" in processor.prompts[1]
+
+
+def test_redline_suggestions_unexpected_json_shape():
+    processor = CannedLLMProcessor(
+        '[{"clause_id": "clause_1", "suggestion": "Cap liability at fees paid."}]', "Soften it.", "Add notice."
+    )
+    clauses = [make_clause(1, "Unlimited liability"), make_clause(2, "Immediate termination")]
+
+    suggestions = processor.generate_redline_suggestions(clauses)
+
+    assert [s['suggestion'] for s in suggestions] == ["Soften it.", "Add notice."]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
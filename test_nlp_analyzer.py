@@ -0,0 +1,92 @@
+"""
+Equivalence tests for the legal construct matcher
+Compares the lowercase-hash pattern check with spaCy's Matcher on the same patterns
+"""
+import sys
+from pathlib import Path
+
+import pytest
+import spacy
+from spacy.matcher import Matcher
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from modules import nlp_analyzer
+from modules.document_parser import DocumentParser
+
+SAMPLE_CONTRACT = Path(__file__).parent / 'utils' / 'sample_contracts' / 'unfavorable_service_agreement.txt'
+
+# Token patterns as they were registered with spaCy's Matcher
+MATCHER_PATTERNS = {
+    "OBLIGATION": [
+        [{"LOWER": "shall"}],
+        [{"LOWER": "must"}],
+        [{"LOWER": "will"}],
+        [{"LOWER": "agrees"}, {"LOWER": "to"}],
+        [{"LOWER": "obligated"}, {"LOWER": "to"}],
+        [{"LOWER": "required"}, {"LOWER": "to"}],
+        [{"LOWER": "responsible"}, {"LOWER": "for"}],
+    ],
+    "RIGHT": [
+        [{"LOWER": "may"}],
+        [{"LOWER": "entitled"}, {"LOWER": "to"}],
+        [{"LOWER": "has"}, {"LOWER": "the"}, {"LOWER": "right"}],
+        [{"LOWER": "permitted"}, {"LOWER": "to"}],
+        [{"LOWER": "authorized"}, {"LOWER": "to"}],
+    ],
+    "PROHIBITION": [
+        [{"LOWER": "shall"}, {"LOWER": "not"}],
+        [{"LOWER": "must"}, {"LOWER": "not"}],
+        [{"LOWER": "will"}, {"LOWER": "not"}],
+        [{"LOWER": "prohibited"}, {"LOWER": "from"}],
+        [{"LOWER": "not"}, {"LOWER": "permitted"}],
+        [{"LOWER": "may"}, {"LOWER": "not"}],
+    ],
+}
+
+EXTRA_CLAUSES = [
+    "The Vendor shall not disclose any information.",
+    "The Client has the right to terminate. It is not permitted to assign.",
+    "Either party MAY NOT assign; the Vendor is Responsible For losses.",
+    "The Vendor may\nnot subcontract, and has  the right to audit.",
+    "Payment is due within thirty days.",
+    "shall",
+]
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    # The matcher only needs tokenization, so a blank pipeline stands in for the model
+    nlp = spacy.blank("en")
+    monkeypatch.setattr(nlp_analyzer, "_load_spacy_model", lambda name: nlp)
+    return nlp_analyzer.NLPAnalyzer()
+
+
+def reference_labels(nlp, clauses):
+    """Labels found by spaCy's Matcher for each clause"""
+    matcher = Matcher(nlp.vocab)
+    for label, patterns in MATCHER_PATTERNS.items():
+        matcher.add(label, patterns)
+    return [
+        {nlp.vocab.strings[match_id] for match_id, _, _ in matcher(nlp.make_doc(clause['content']))}
+        for clause in clauses
+    ]
+
+
+def test_construct_labels_match_spacy_matcher(analyzer):
+    text = SAMPLE_CONTRACT.read_text(encoding='utf-8')
+    clauses = DocumentParser().extract_clauses(text) + [
+        {'clause_id': f"X{idx}", 'clause_number': str(idx), 'content': content}
+        for idx, content in enumerate(EXTRA_CLAUSES, 1)
+    ]
+    names = {label_id: name for name, label_id in analyzer._label_ids.items()}
+
+    labels = [{names[label_id] for label_id in found} for found in analyzer._match_labels(clauses)]
+
+    assert labels == reference_labels(analyzer.nlp, clauses)
+    assert any(labels)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,84 @@
+"""
+Equivalence tests for clause risk scoring
+Compares the vectorized scoring with the per-category keyword loop it replaced
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+import config
+from modules.document_parser import DocumentParser
+from modules.risk_assessor import RiskAssessor
+
+SAMPLE_CONTRACT = Path(__file__).parent / 'utils' / 'sample_contracts' / 'unfavorable_service_agreement.txt'
+
+
+def reference_clause_risks(assessor, clauses):
+    """Per-clause, per-category keyword count and score"""
+    clause_risks = []
+    for clause in clauses:
+        content_lower = clause['content'].lower()
+        category_scores = {}
+        detected_risks = []
+        for category, config_data in assessor.risk_categories.items():
+            keywords = config_data['keywords']
+            weight = config_data['weight']
+            matches = sum(1 for keyword in keywords if keyword in content_lower)
+            if matches > 0:
+                if matches >= 5:
+                    score = min(1.0, 0.7 + (matches * 0.05)) * weight
+                elif matches >= 3:
+                    score = min(1.0, 0.4 + (matches * 0.05)) * weight
+                else:
+                    score = min(1.0, 0.15 + (matches * 0.05)) * weight
+                category_scores[category] = score
+                detected_risks.append({
+                    'category': category,
+                    'score': round(score, 2),
+                    'matched_keywords': [kw for kw in keywords if kw in content_lower]
+                })
+        clause_risk_score = max(category_scores.values()) if category_scores else 0.0
+        clause_risks.append({
+            'clause_id': clause['clause_id'],
+            'clause_number': clause['clause_number'],
+            'content': clause['content'],
+            'risk_score': round(clause_risk_score, 2),
+            'risk_level': assessor._get_risk_level(clause_risk_score),
+            'detected_risks': detected_risks,
+            'risk_categories': list(category_scores.keys())
+        })
+    return clause_risks
+
+
+def synthetic_clauses():
+    """Clauses hitting 0 to 7 keywords of each category, covering every score band"""
+    clauses = []
+    for category, config_data in config.RISK_CATEGORIES.items():
+        for count in (0, 1, 2, 3, 4, 5, 7):
+            content = "The parties agree. " + " and ".join(config_data['keywords'][:count])
+            clauses.append({
+                'clause_id': f"{category}_{count}",
+                'clause_number': str(count),
+                'content': content
+            })
+    return clauses
+
+
+def test_clause_risks_match_reference_on_sample_contract():
+    assessor = RiskAssessor()
+    clauses = DocumentParser().extract_clauses(SAMPLE_CONTRACT.read_text(encoding='utf-8'))
+    assert clauses
+    assert assessor.assess_clause_risks(clauses) == reference_clause_risks(assessor, clauses)
+
+
+def test_clause_risks_match_reference_in_every_score_band():
+    assessor = RiskAssessor()
+    clauses = synthetic_clauses()
+    assert assessor.assess_clause_risks(clauses) == reference_clause_risks(assessor, clauses)
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
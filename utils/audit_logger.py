@@ -11,7 +11,6 @@ import logging
 
 import config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +32,7 @@ class AuditLogger:
         
         Args:
             document_info: Information about the analyzed document
+                (file_hash, if given, is used instead of hashing file_path)
             analysis_results: Results of the analysis
             user_info: Optional user information
             
@@ -46,13 +46,20 @@ class AuditLogger:
         timestamp = datetime.now().isoformat()
         audit_id = self._generate_audit_id(document_info, timestamp)
         
+        # Use a precomputed SHA-256 if the caller already has one
+        file_hash = document_info.get('file_hash')
+        if file_hash:
+            file_hash = file_hash[:32]
+        else:
+            file_hash = self._hash_file(document_info.get('file_path'))
+        
         # Create audit record
         audit_record = {
             'audit_id': audit_id,
             'timestamp': timestamp,
             'document_info': {
                 'filename': document_info.get('filename', 'unknown'),
-                'file_hash': self._hash_file(document_info.get('file_path')),
+                'file_hash': file_hash,
                 'file_size': document_info.get('file_size', 0),
                 'file_type': document_info.get('file_type', 'unknown')
             },
@@ -231,6 +238,7 @@ class AuditLogger:
 
 if __name__ == "__main__":
     # Test audit logger
+    logging.basicConfig(level=logging.INFO)
     logger_instance = AuditLogger()
     print(f"Audit logging enabled: {logger_instance.enabled}")
     print(f"Audit directory: {logger_instance.audit_dir}")
@@ -8,6 +8,24 @@ from typing import List, Dict
 import unicodedata
 
 
+# Patterns for Indian and international currencies
+_AMOUNT_PATTERNS = [
+    (re.compile(r'₹\s*(\d+(?:,\d{3})*(?:\.\d+)?)', re.IGNORECASE), 'INR'),
+    (re.compile(r'Rs\.?\s*(\d+(?:,\d{3})*(?:\.\d+)?)', re.IGNORECASE), 'INR'),
+    (re.compile(r'INR\s*(\d+(?:,\d{3})*(?:\.\d+)?)', re.IGNORECASE), 'INR'),
+    (re.compile(r'\$\s*(\d+(?:,\d{3})*(?:\.\d+)?)', re.IGNORECASE), 'USD'),
+    (re.compile(r'USD\s*(\d+(?:,\d{3})*(?:\.\d+)?)', re.IGNORECASE), 'USD'),
+]
+
+# Common date patterns
+_DATE_PATTERNS = [
+    re.compile(r'\d{1,2}[-/]\d{1,2}[-/]\d{2,4}', re.IGNORECASE),  # DD-MM-YYYY or MM/DD/YYYY
+    re.compile(r'\d{4}[-/]\d{1,2}[-/]\d{1,2}', re.IGNORECASE),    # YYYY-MM-DD
+    re.compile(r'\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}', re.IGNORECASE),  # DD Month YYYY
+    re.compile(r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}', re.IGNORECASE),  # Month DD, YYYY
+]
+
+
 class TextProcessor:
     """Utility class for text processing operations"""
     
@@ -76,17 +94,8 @@ class TextProcessor:
         """
         amounts = []
         
-        # Patterns for Indian and international currencies
-        patterns = [
-            (r'₹\s*(\d+(?:,\d{3})*(?:\.\d+)?)', 'INR'),
-            (r'Rs\.?\s*(\d+(?:,\d{3})*(?:\.\d+)?)', 'INR'),
-            (r'INR\s*(\d+(?:,\d{3})*(?:\.\d+)?)', 'INR'),
-            (r'\$\s*(\d+(?:,\d{3})*(?:\.\d+)?)', 'USD'),
-            (r'USD\s*(\d+(?:,\d{3})*(?:\.\d+)?)', 'USD'),
-        ]
-        
-        for pattern, currency in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern, currency in _AMOUNT_PATTERNS:
+            matches = pattern.finditer(text)
             for match in matches:
                 amounts.append({
                     'amount': match.group(1),
@@ -109,16 +118,8 @@ class TextProcessor:
         """
         dates = []
         
-        # Common date patterns
-        patterns = [
-            r'\d{1,2}[-/]\d{1,2}[-/]\d{2,4}',  # DD-MM-YYYY or MM/DD/YYYY
-            r'\d{4}[-/]\d{1,2}[-/]\d{1,2}',    # YYYY-MM-DD
-            r'\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}',  # DD Month YYYY
-            r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}',  # Month DD, YYYY
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in _DATE_PATTERNS:
+            matches = pattern.findall(text)
             dates.extend(matches)
         
         return dates